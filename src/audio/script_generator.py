@@ -1,16 +1,24 @@
 """Generate podcast script from briefing data."""
 
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 
 class ScriptGenerator:
     """Convert briefing data into a natural spoken script."""
 
+    # Lead-ins for the first, middle, and last top stories
+    STORY_PREFIXES = (
+        "Our top story today:",
+        "Next up:",
+        "And finally in our top stories:",
+    )
+
     def generate(
         self,
         processed_data: Dict[str, Any],
         newsletters_processed: List[str],
+        today: Optional[datetime] = None,
     ) -> str:
         """
         Generate a podcast script from processed briefing data.
@@ -18,11 +26,33 @@ class ScriptGenerator:
         Args:
             processed_data: Output from deduplicator with ranked stories
             newsletters_processed: List of newsletter names that were processed
+            today: Briefing date (default: now)
 
         Returns:
             Script text ready for TTS
         """
-        today = datetime.now()
+        return "\n\n".join(
+            self.generate_sections(processed_data, newsletters_processed, today)
+        )
+
+    def generate_sections(
+        self,
+        processed_data: Dict[str, Any],
+        newsletters_processed: List[str],
+        today: Optional[datetime] = None,
+    ) -> List[str]:
+        """
+        Generate the podcast script as an ordered list of sections.
+
+        Args:
+            processed_data: Output from deduplicator with ranked stories
+            newsletters_processed: List of newsletter names that were processed
+            today: Briefing date (default: now)
+
+        Returns:
+            Non-empty script sections in reading order
+        """
+        today = today or datetime.now()
         date_spoken = today.strftime("%A, %B %d")  # "Wednesday, January 28"
 
         top_stories = processed_data.get("top_stories", [])
@@ -46,7 +76,7 @@ class ScriptGenerator:
         # Outro
         sections.append(self._generate_outro(newsletters_processed))
 
-        return "\n\n".join(sections)
+        return [section for section in sections if section]
 
     def _generate_intro(self, date_spoken: str, story_count: int) -> str:
         """Generate the intro section."""
@@ -60,14 +90,11 @@ class ScriptGenerator:
         if not top_stories:
             return ""
 
-        lines = ["First, a quick overview of today's top headlines."]
-
-        for story in top_stories[:5]:
-            headline = story.get("headline", "")
-            if headline:
-                lines.append(headline + ".")
-
-        return " ".join(lines)
+        headlines = (story.get("headline", "") for story in top_stories[:5])
+        return " ".join([
+            "First, a quick overview of today's top headlines.",
+            *(f"{headline}." for headline in headlines if headline),
+        ])
 
     def _generate_top_stories(self, top_stories: List[Dict]) -> str:
         """Generate detailed coverage of top stories."""
@@ -75,6 +102,7 @@ class ScriptGenerator:
             return ""
 
         sections = ["Now, let's dive into the details."]
+        last = len(top_stories)
 
         for i, story in enumerate(top_stories, 1):
             headline = story.get("headline", "")
@@ -83,27 +111,22 @@ class ScriptGenerator:
             sources = story.get("sources", [])
             mention_count = story.get("mention_count", 1)
 
-            # Story intro
-            if i == 1:
-                story_text = f"Our top story today: {headline}. "
-            elif i == len(top_stories):
-                story_text = f"And finally in our top stories: {headline}. "
-            else:
-                story_text = f"Next up: {headline}. "
-
-            # Summary
-            if summary:
-                story_text += summary + " "
-
-            # Why it matters
-            if why_it_matters:
-                story_text += f"Why this matters: {why_it_matters} "
+            # Story intro: first, middle, or last
+            prefix = self.STORY_PREFIXES[0 if i == 1 else 2 if i == last else 1]
 
             # Source attribution for multi-source stories
-            if mention_count > 1 and sources:
-                story_text += f"This story was covered by {mention_count} newsletters including {sources[0]}."
-
-            sections.append(story_text.strip())
+            attribution = (
+                f"This story was covered by {mention_count} newsletters including {sources[0]}."
+                if mention_count > 1 and sources
+                else ""
+            )
+
+            sections.append(" ".join(filter(None, [
+                f"{prefix} {headline}.",
+                summary,
+                f"Why this matters: {why_it_matters}" if why_it_matters else "",
+                attribution,
+            ])))
 
         return "\n\n".join(sections)
 
@@ -122,7 +145,8 @@ class ScriptGenerator:
 
             if headline and summary:
                 # Use first sentence of summary only for brevity
-                first_sentence = summary.split(". ")[0]
+                end = summary.find(". ")
+                first_sentence = summary if end == -1 else summary[:end]
                 if not first_sentence.endswith("."):
                     first_sentence += "."
                 lines.append(f"{headline}. {first_sentence}")
@@ -1,14 +1,41 @@
 """ElevenLabs TTS client for generating podcast audio."""
 
 import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Union
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from ..config import get_config
 
 
+# Shared keep-alive session so repeated and parallel chunk requests reuse
+# TCP+TLS connections. Synthesis is billed per character, so a chunk is only
+# retried when ElevenLabs can't have processed it: connection failures and
+# 429 rate limiting. Read errors and 5xx responses are not retried.
+_session = requests.Session()
+_session.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=8,
+        max_retries=Retry(
+            total=3,
+            connect=3,
+            read=0,
+            backoff_factor=1,
+            status_forcelist=(429,),
+            allowed_methods=frozenset({"POST"}),
+            raise_on_status=False,
+        ),
+    ),
+)
+
+
 class TTSClient:
     """ElevenLabs Text-to-Speech client."""
 
@@ -20,6 +47,17 @@ class TTSClient:
     # Adam - clear, professional male voice
     DEFAULT_VOICE_ID = "21m00Tcm4TlvDq8ikWAM"  # Rachel
 
+    # Streaming latency optimization level (0-4, higher = faster first byte)
+    STREAMING_LATENCY = 3
+
+    # Bytes read from the response per write to disk
+    CHUNK_SIZE = 4096
+
+    # Long scripts are split on paragraph boundaries into requests of at
+    # most this many characters, which are synthesized concurrently
+    MAX_CHUNK_CHARS = 2500
+    MAX_CONCURRENT_REQUESTS = 4
+
     def __init__(self):
         """Initialize the TTS client."""
         self.config = get_config()
@@ -30,15 +68,19 @@ class TTSClient:
 
     def generate_audio(
         self,
-        text: str,
+        text: Union[str, List[str]],
         output_path: Optional[Path] = None,
         voice_id: Optional[str] = None,
     ) -> Path:
         """
         Generate audio from text using ElevenLabs API.
 
+        Long scripts are split into paragraph-aligned chunks that are
+        synthesized in parallel, then the MP3 streams are concatenated in
+        script order.
+
         Args:
-            text: The script text to convert to speech
+            text: The script text (or list of script sections) to convert to speech
             output_path: Where to save the MP3 file (default: temp file)
             voice_id: ElevenLabs voice ID (default: Rachel)
 
@@ -50,8 +92,86 @@ class TTSClient:
         # Set output path
         if output_path is None:
             output_path = Path("briefing_audio.mp3")
+        output_path = Path(output_path)
+
+        chunks = self.split_script(text)
+        if not chunks:
+            raise ValueError("No script text to convert to speech")
+
+        char_count = sum(len(chunk) for chunk in chunks)
+        print(f"Generating audio ({char_count} characters, {len(chunks)} chunks)...")
+
+        if len(chunks) == 1:
+            bytes_written = self._stream_to_file(chunks[0], output_path, voice_id)
+        else:
+            part_paths = [
+                output_path.with_name(f"{output_path.stem}.part{i}{output_path.suffix}")
+                for i in range(len(chunks))
+            ]
+            try:
+                workers = min(len(chunks), self.MAX_CONCURRENT_REQUESTS)
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    # Summing consumes the iterator, so any chunk failure is raised here
+                    bytes_written = sum(executor.map(
+                        self._stream_to_file,
+                        chunks,
+                        part_paths,
+                        [voice_id] * len(chunks),
+                    ))
+
+                # MP3 frames from the same voice/settings concatenate cleanly
+                with open(output_path, "wb") as out:
+                    for part_path in part_paths:
+                        with open(part_path, "rb") as f:
+                            shutil.copyfileobj(f, out)
+            finally:
+                for part_path in part_paths:
+                    if part_path.exists():
+                        part_path.unlink()
+
+        file_size_mb = bytes_written / (1024 * 1024)
+        print(f"[OK] Audio generated: {output_path} ({file_size_mb:.2f} MB)")
+
+        return output_path
+
+    def split_script(self, text: Union[str, List[str]]) -> List[str]:
+        """
+        Split a script into paragraph-aligned chunks for parallel synthesis.
 
-        url = f"{self.BASE_URL}/text-to-speech/{voice_id}"
+        Args:
+            text: Full script text or list of script sections
+
+        Returns:
+            Ordered list of non-empty chunks, each at most MAX_CHUNK_CHARS
+            long unless a single paragraph exceeds the limit
+        """
+        sections = [text] if isinstance(text, str) else text
+
+        paragraphs = []
+        for section in sections:
+            paragraphs.extend(p.strip() for p in section.split("\n\n") if p.strip())
+
+        chunks = []
+        current = []
+        current_len = 0
+        for paragraph in paragraphs:
+            added_len = len(paragraph) + (2 if current else 0)
+            if current and current_len + added_len > self.MAX_CHUNK_CHARS:
+                chunks.append("\n\n".join(current))
+                current = []
+                current_len = 0
+                added_len = len(paragraph)
+            current.append(paragraph)
+            current_len += added_len
+
+        if current:
+            chunks.append("\n\n".join(current))
+
+        return chunks
+
+    def _stream_to_file(self, text: str, output_path: Path, voice_id: str) -> int:
+        """Synthesize a single chunk of text, stream the MP3 to disk, and return its size."""
+        url = f"{self.BASE_URL}/text-to-speech/{voice_id}/stream"
 
         headers = {
             "Accept": "audio/mpeg",
@@ -71,24 +191,30 @@ class TTSClient:
             },
         }
 
-        print(f"Generating audio ({len(text)} characters)...")
-
-        response = requests.post(url, json=data, headers=headers, timeout=300)
-
-        if response.status_code != 200:
-            error_msg = response.text
-            raise RuntimeError(
-                f"ElevenLabs API error ({response.status_code}): {error_msg}"
-            )
-
-        # Save audio file
-        with open(output_path, "wb") as f:
-            f.write(response.content)
-
-        file_size_mb = output_path.stat().st_size / (1024 * 1024)
-        print(f"[OK] Audio generated: {output_path} ({file_size_mb:.2f} MB)")
-
-        return output_path
+        params = {"optimize_streaming_latency": self.STREAMING_LATENCY}
+
+        with _session.post(
+            url,
+            params=params,
+            json=data,
+            headers=headers,
+            stream=True,
+            timeout=300,
+        ) as response:
+            if response.status_code != 200:
+                error_msg = response.text
+                raise RuntimeError(
+                    f"ElevenLabs API error ({response.status_code}): {error_msg}"
+                )
+
+            # Stream audio to disk as it arrives
+            bytes_written = 0
+            with open(output_path, "wb") as f:
+                for chunk in response.iter_content(chunk_size=self.CHUNK_SIZE):
+                    f.write(chunk)
+                    bytes_written += len(chunk)
+
+        return bytes_written
 
     def get_character_count(self, text: str) -> int:
         """Get character count for cost estimation."""
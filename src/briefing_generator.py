@@ -4,29 +4,41 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
 
 from .config import get_config
 
 
+TEMPLATE_DIR = Path(__file__).parent.parent / "templates"
+TEMPLATE_NAME = "briefing_template.html"
+
+# Shared Jinja2 environment - templates don't change at runtime, so skip
+# the per-render filesystem checks for modified templates. Compiled template
+# bytecode is cached on disk (in a per-user temp directory) so fresh
+# processes skip parsing.
+_env = Environment(
+    loader=FileSystemLoader(TEMPLATE_DIR),
+    autoescape=True,
+    auto_reload=False,
+    cache_size=32,
+    bytecode_cache=FileSystemBytecodeCache(),
+)
+
+
 class BriefingGenerator:
     """Generate HTML email briefing from deduplicated stories."""
 
     def __init__(self):
-        """Initialize the generator with Jinja2 environment."""
+        """Initialize the generator with the shared Jinja2 environment."""
         self.config = get_config()
-
-        # Setup Jinja2 template loader
-        template_dir = Path(__file__).parent.parent / "templates"
-        self.env = Environment(
-            loader=FileSystemLoader(template_dir),
-            autoescape=True,
-        )
+        self.env = _env
+        self.template = self.env.get_template(TEMPLATE_NAME)
 
     def generate(
         self,
         processed_data: Dict[str, Any],
         newsletters_processed: List[str],
+        today: Optional[datetime] = None,
     ) -> Dict[str, str]:
         """
         Generate HTML and text briefing.
@@ -34,11 +46,12 @@ class BriefingGenerator:
         Args:
             processed_data: Output from deduplicator with ranked stories
             newsletters_processed: List of newsletter names that were processed
+            today: Briefing date (default: now)
 
         Returns:
             Dictionary with 'html', 'text', and 'subject' keys
         """
-        today = datetime.now()
+        today = today or datetime.now()
         date_str = today.strftime("%B %d, %Y")
         weekday = today.strftime("%A")
 
@@ -55,8 +68,7 @@ class BriefingGenerator:
         exec_summary = self._build_executive_summary(top_stories)
 
         # Render HTML
-        template = self.env.get_template("briefing_template.html")
-        html = template.render(
+        html = self.template.render(
             date=date_str,
             weekday=weekday,
             executive_summary=exec_summary,
@@ -125,25 +137,26 @@ class BriefingGenerator:
             "-" * 30,
         ]
 
-        for bullet in exec_summary:
-            lines.append(f"• {bullet}")
+        lines.extend(f"• {bullet}" for bullet in exec_summary)
 
         lines.extend(["", "TOP STORIES", "-" * 30])
 
         for i, story in enumerate(top_stories, 1):
-            lines.append(f"\n{i}. {story.get('headline', '')}")
-            lines.append(f"   {story.get('summary', '')}")
-            if story.get("why_it_matters"):
-                lines.append(f"   Why it matters: {story['why_it_matters']}")
+            why = story.get("why_it_matters")
             sources = ", ".join(story.get("sources", []))
-            if sources:
-                lines.append(f"   Sources: {sources}")
+            lines.append(
+                f"\n{i}. {story.get('headline', '')}\n"
+                f"   {story.get('summary', '')}"
+                + (f"\n   Why it matters: {why}" if why else "")
+                + (f"\n   Sources: {sources}" if sources else "")
+            )
 
         if secondary_stories:
             lines.extend(["", "MORE STORIES", "-" * 30])
-            for story in secondary_stories:
-                lines.append(f"• {story.get('headline', '')}")
-                lines.append(f"  {story.get('summary', '')}")
+            lines.extend(
+                f"• {story.get('headline', '')}\n  {story.get('summary', '')}"
+                for story in secondary_stories
+            )
 
         lines.extend([
             "",
@@ -1,16 +1,30 @@
 """Configuration management for Daily News Synthesizer."""
 
 import os
+from email.utils import parseaddr
+from functools import cached_property, lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 import yaml
 from dotenv import load_dotenv
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 # Load environment variables
 load_dotenv()
 
 
+@lru_cache(maxsize=4)
+def _load_yaml_cached(path: str) -> Dict[str, Any]:
+    """Parse a YAML file once per absolute path (callers must not mutate)."""
+    with open(path, "r") as f:
+        return yaml.load(f, Loader=SafeLoader)
+
+
 class Config:
     """Configuration manager that combines config.yaml with environment variables."""
 
@@ -29,10 +43,15 @@ class Config:
         self._config = self._load_yaml(config_path)
         self._env = os.environ.get("ENVIRONMENT", "local")
 
+        # Lowercased sender address -> display name for constant-time lookup
+        self._source_names = {
+            src["email"].lower(): src["name"]
+            for src in self._config.get("newsletter_sources", [])
+        }
+
     def _load_yaml(self, path: Path) -> Dict[str, Any]:
         """Load configuration from YAML file."""
-        with open(path, "r") as f:
-            return yaml.safe_load(f)
+        return _load_yaml_cached(str(Path(path).resolve()))
 
     @property
     def is_github_actions(self) -> bool:
@@ -45,12 +64,12 @@ class Config:
         return os.environ.get("DEBUG", "false").lower() == "true"
 
     # Newsletter sources
-    @property
+    @cached_property
     def newsletter_sources(self) -> List[Dict[str, str]]:
         """Get list of newsletter sources with email and name."""
         return self._config.get("newsletter_sources", [])
 
-    @property
+    @cached_property
     def newsletter_emails(self) -> List[str]:
         """Get list of newsletter email addresses."""
         return [src["email"] for src in self.newsletter_sources]
@@ -58,9 +77,16 @@ class Config:
     def get_source_name(self, email: str) -> str:
         """Get display name for a newsletter source email."""
         email_lower = email.lower()
-        for src in self.newsletter_sources:
-            if src["email"].lower() in email_lower or email_lower in src["email"].lower():
-                return src["name"]
+
+        # Exact match on the bare address ("Name <addr>" -> "addr")
+        name = self._source_names.get(parseaddr(email_lower)[1])
+        if name:
+            return name
+
+        # Fall back to substring matching for unusual From headers
+        for src_email, name in self._source_names.items():
+            if src_email in email_lower or email_lower in src_email:
+                return name
         return email
 
     # Briefing settings
@@ -72,32 +98,57 @@ class Config:
             self._config.get("briefing", {}).get("recipient", "")
         )
 
-    @property
+    @cached_property
     def subject_prefix(self) -> str:
         """Get email subject prefix."""
         return self._config.get("briefing", {}).get("subject_prefix", "[AI Briefing]")
 
-    @property
+    @cached_property
     def top_stories_count(self) -> int:
         """Get number of top stories to highlight."""
         return self._config.get("briefing", {}).get("top_stories_count", 5)
 
     # Claude settings
-    @property
+    @cached_property
     def claude_model(self) -> str:
         """Get Claude model to use."""
         return self._config.get("claude", {}).get("model", "claude-sonnet-4-5-20250929")
 
-    @property
+    @cached_property
     def claude_max_tokens(self) -> int:
         """Get max tokens for Claude responses."""
         return self._config.get("claude", {}).get("max_tokens", 8000)
 
-    @property
+    @cached_property
     def claude_temperature(self) -> float:
         """Get temperature for Claude responses."""
         return self._config.get("claude", {}).get("temperature", 0.3)
 
+    @cached_property
+    def max_concurrent_claude_calls(self) -> int:
+        """Get max number of Claude requests in flight at once."""
+        return self._config.get("claude", {}).get("max_concurrent_calls", 5)
+
+    @cached_property
+    def claude_context_budget(self) -> int:
+        """Get max tokens (input + output) per newsletter extraction call."""
+        return self._config.get("claude", {}).get("context_budget_tokens", 32000)
+
+    @cached_property
+    def claude_use_batch_api(self) -> bool:
+        """Check if newsletter extraction should use the Message Batches API."""
+        return self._config.get("claude", {}).get("use_batch_api", False)
+
+    @cached_property
+    def claude_cache_extractions(self) -> bool:
+        """Check if extracted stories should be cached on disk."""
+        return self._config.get("claude", {}).get("cache_extractions", False)
+
+    @cached_property
+    def claude_batch_timeout(self) -> int:
+        """Get max seconds to wait for a Message Batch before falling back."""
+        return self._config.get("claude", {}).get("batch_timeout_seconds", 480)
+
     @property
     def anthropic_api_key(self) -> str:
         """Get Anthropic API key."""
@@ -117,6 +168,11 @@ class Config:
         """Get Gmail token JSON (GitHub Actions)."""
         return os.environ.get("GMAIL_TOKEN_JSON")
 
+    @cached_property
+    def gmail_cache_messages(self) -> bool:
+        """Check if parsed Gmail messages should be cached on disk."""
+        return self._config.get("gmail", {}).get("cache_messages", False)
+
     # ElevenLabs settings
     @property
     def elevenlabs_api_key(self) -> Optional[str]:
@@ -129,27 +185,17 @@ class Config:
         return bool(self.elevenlabs_api_key)
 
     # Major AI companies (for context)
-    @property
+    @cached_property
     def major_ai_companies(self) -> List[str]:
         """Get list of major AI companies."""
         return self._config.get("major_ai_companies", [])
 
     # Retry settings
-    @property
+    @cached_property
     def max_retry_attempts(self) -> int:
         """Get max retry attempts for API calls."""
         return self._config.get("retry", {}).get("max_attempts", 3)
 
-    @property
-    def retry_base_delay(self) -> int:
-        """Get base delay in seconds for retries."""
-        return self._config.get("retry", {}).get("base_delay_seconds", 5)
-
-    @property
-    def retry_max_delay(self) -> int:
-        """Get max delay in seconds for retries."""
-        return self._config.get("retry", {}).get("max_delay_seconds", 60)
-
 
 # Global config instance
 _config: Optional[Config] = None
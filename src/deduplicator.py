@@ -1,23 +1,141 @@
 """Deduplication and ranking of news stories using Claude API."""
 
+import itertools
 import json
+import logging
 import re
-from typing import Any, Dict, List
+import string
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Set, Union
+from urllib.parse import parse_qsl, urlencode, urlparse
 
 from anthropic import Anthropic
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import numpy as np
+    from fastembed import TextEmbedding
+    EMBEDDINGS_AVAILABLE = True
+except ImportError:
+    EMBEDDINGS_AVAILABLE = False
+
 from .config import get_config
 
 
+logger = logging.getLogger(__name__)
+
+# Markdown code-fence fallback for JSON extraction from Claude responses
+_JSON_FENCE_RE = re.compile(r"```json\s*(.*?)\s*```", re.DOTALL)
+
+_PUNCT_TABLE = str.maketrans("", "", string.punctuation)
+
+# Query parameters dropped from URLs before duplicate matching
+_TRACKING_PARAM_PREFIXES = ("utm_", "mc_", "_hs")
+_TRACKING_PARAMS = frozenset({
+    "ref", "ref_src", "ref_url", "referrer", "fbclid", "gclid", "dclid",
+    "msclkid", "yclid", "igshid", "mkt_tok", "s_cid", "cmpid", "sref",
+})
+
+# Optional near-duplicate grouping with local embeddings (fastembed). Stories
+# whose headline+summary embeddings reach this cosine similarity are sent to
+# Claude as one story with "possible_duplicates", which Claude may split again.
+# The threshold is deliberately high: "GPT-4" vs "GPT-5" headlines embed close.
+EMBEDDING_MODEL = "BAAI/bge-small-en-v1.5"
+EMBEDDING_SIMILARITY_THRESHOLD = 0.92
+EMBEDDING_BATCH_SIZE = 64
+
+
+def _json_dumps(data: Any) -> str:
+    """Serialize to indented JSON, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode("utf-8")
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+
+def _json_loads(text: Union[str, bytes, bytearray]) -> Any:
+    """
+    Parse JSON, using orjson when available.
+
+    orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers only
+    need to handle the stdlib exception.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _normalize_headline(headline: Optional[str]) -> str:
+    """Lowercase a headline, strip punctuation and collapse whitespace."""
+    return " ".join((headline or "").lower().translate(_PUNCT_TABLE).split())
+
+
+def _canonical_url(url: Optional[str]) -> Optional[str]:
+    """
+    Reduce a URL to a duplicate-matching key (None if unusable).
+
+    Keeps host, path and query (minus tracking parameters) so URLs that
+    identify content by query, like youtube.com/watch?v=..., stay distinct.
+    """
+    if not url or not isinstance(url, str):
+        return None
+    parsed = urlparse(url.strip())
+    path = parsed.path.rstrip("/")
+    query = urlencode(sorted(
+        (key, value)
+        for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if not _is_tracking_param(key)
+    ))
+    # Bare domains (e.g. https://openai.com) don't identify a single story
+    if not parsed.netloc or not (path or query):
+        return None
+    host = parsed.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    key = f"{host}{path}".lower()
+    return f"{key}?{query}" if query else key
+
+
+def _is_tracking_param(key: str) -> bool:
+    """Check if a query parameter only tracks the click, not the content."""
+    key = key.lower()
+    return key.startswith(_TRACKING_PARAM_PREFIXES) or key in _TRACKING_PARAMS
+
+
+def _find_root(parent: List[int], i: int) -> int:
+    """Find the union-find root of i, halving the path on the way."""
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+@lru_cache(maxsize=1)
+def _get_embedding_model() -> "TextEmbedding":
+    """Load the embedding model once (downloaded on first use)."""
+    return TextEmbedding(EMBEDDING_MODEL)
+
+
 class Deduplicator:
     """Deduplicate and rank news stories using Claude API."""
 
-    def __init__(self):
-        """Initialize with Claude client."""
+    def __init__(self, client: Optional[Anthropic] = None):
+        """
+        Initialize with Claude client.
+
+        Args:
+            client: Optional Anthropic client to share. Creates one if not provided.
+        """
         self.config = get_config()
-        self.client = Anthropic(
+        self.client = client or Anthropic(
             api_key=self.config.anthropic_api_key,
             timeout=300.0,
+            # Per-request retries with backoff on 429/5xx/connection errors
+            max_retries=self.config.max_retry_attempts,
         )
 
     def process(self, raw_stories: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -33,14 +151,29 @@ class Deduplicator:
         if not raw_stories:
             return self._empty_result()
 
-        print(f"\nProcessing {len(raw_stories)} raw stories...")
+        logger.info("\nProcessing %d raw stories...", len(raw_stories))
+
+        stories = self._precluster(raw_stories)
+        if len(stories) < len(raw_stories):
+            logger.info(
+                "  Pre-merged %d duplicate stories locally",
+                len(raw_stories) - len(stories),
+            )
 
-        system_prompt = self._build_system_prompt(len(raw_stories))
-        user_prompt = self._build_user_prompt(raw_stories)
+        merged_count = len(stories)
+        stories = self._group_possible_duplicates(stories)
+        if len(stories) < merged_count:
+            logger.info(
+                "  Grouped %d likely near-duplicate stories locally",
+                merged_count - len(stories),
+            )
+
+        system_prompt = self._build_system_prompt(len(stories), len(raw_stories))
+        user_prompt = self._build_user_prompt(stories)
 
         try:
             # Use streaming for large responses
-            response_text = ""
+            buffer = bytearray()
             with self.client.messages.stream(
                 model=self.config.claude_model,
                 max_tokens=self.config.claude_max_tokens,
@@ -49,34 +182,212 @@ class Deduplicator:
                 messages=[{"role": "user", "content": user_prompt}],
             ) as stream:
                 for text in stream.text_stream:
-                    response_text += text
+                    buffer.extend(text.encode("utf-8"))
 
-            result = self._parse_response(response_text)
+            result = self._parse_response(buffer)
+            self._reinflate_sources(result, stories)
 
             # Log summary
-            print(f"\n[OK] Deduplication complete:")
-            print(f"  Original: {len(raw_stories)} stories")
-            print(f"  Top stories: {len(result.get('top_stories', []))}")
-            print(f"  Secondary stories: {len(result.get('secondary_stories', []))}")
-            print(f"  Other stories: {len(result.get('other_stories', []))}")
+            logger.info("\n[OK] Deduplication complete:")
+            logger.info("  Original: %d stories", len(raw_stories))
+            logger.info("  Top stories: %d", len(result.get("top_stories", [])))
+            logger.info("  Secondary stories: %d", len(result.get("secondary_stories", [])))
+            logger.info("  Other stories: %d", len(result.get("other_stories", [])))
 
             return result
 
         except json.JSONDecodeError as e:
-            print(f"[ERROR] Failed to parse JSON: {e}")
+            logger.error("[ERROR] Failed to parse JSON: %s", e)
             return self._empty_result()
         except Exception as e:
-            print(f"[ERROR] Failed to deduplicate: {e}")
+            logger.error("[ERROR] Failed to deduplicate: %s", e)
             return self._empty_result()
 
-    def _build_system_prompt(self, story_count: int) -> str:
+    def _precluster(self, stories: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Merge duplicate stories locally before sending them to Claude.
+
+        Only stories sharing a canonical URL or an identical normalized
+        headline are merged; those are certain duplicates. A URL that one
+        newsletter links from several stories (an issue page, a "read
+        online" link) doesn't identify a story and is ignored. Similar but
+        not identical headlines ("GPT-4" vs "GPT-5", the same launch in Search vs
+        Gmail) are left for Claude to judge. Each group is represented by its
+        first story, with the others attached as a "duplicates" list that
+        keeps their summaries, so Claude still has every source, URL and
+        detail.
+
+        Args:
+            stories: List of raw extracted stories
+
+        Returns:
+            One story per group, in original order
+        """
+        parent = list(range(len(stories)))
+        url_keys = [_canonical_url(story.get("url")) for story in stories]
+        hub_urls = self._hub_urls(stories, url_keys)
+
+        # Exact matches on canonical URL or normalized headline
+        first_by_key: Dict[str, int] = {}
+        for i, story in enumerate(stories):
+            headline = _normalize_headline(story.get("headline"))
+            keys = [f"headline:{headline}"] if headline else []
+            url_key = url_keys[i]
+            if url_key and url_key not in hub_urls:
+                keys.append(f"url:{url_key}")
+            for key in keys:
+                if key in first_by_key:
+                    parent[_find_root(parent, i)] = _find_root(parent, first_by_key[key])
+                else:
+                    first_by_key[key] = i
+
+        groups: Dict[int, List[int]] = {}
+        for i in range(len(stories)):
+            groups.setdefault(_find_root(parent, i), []).append(i)
+
+        clustered = []
+        for indices in groups.values():
+            leader = dict(stories[indices[0]])
+            if len(indices) > 1:
+                leader["duplicates"] = [
+                    {
+                        "headline": stories[i].get("headline"),
+                        "summary": stories[i].get("summary"),
+                        "source": stories[i].get("source"),
+                        "url": stories[i].get("url"),
+                    }
+                    for i in indices[1:]
+                ]
+            clustered.append(leader)
+
+        return clustered
+
+    def _group_possible_duplicates(
+        self, stories: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Group likely near-duplicate stories with local embeddings.
+
+        Runs only when fastembed is installed. Headline+summary embeddings
+        are normalized and compared pairwise; stories from different sources
+        at or above EMBEDDING_SIMILARITY_THRESHOLD are grouped. Each group is
+        represented by its first story, with the others attached in full as a
+        "possible_duplicates" list, so Claude can still split stories that
+        only look alike.
+
+        Args:
+            stories: Stories after exact pre-merging
+
+        Returns:
+            One story per group, in original order
+        """
+        if not EMBEDDINGS_AVAILABLE or len(stories) < 2:
+            return stories
+
+        texts = [
+            f"{story.get('headline') or ''}. {story.get('summary') or ''}"
+            for story in stories
+        ]
+        try:
+            embeddings = np.array(list(
+                _get_embedding_model().embed(texts, batch_size=EMBEDDING_BATCH_SIZE)
+            ))
+        except Exception as e:
+            logger.warning("[WARNING] Embedding pre-clustering skipped: %s", e)
+            return stories
+
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        embeddings = embeddings / np.maximum(norms, 1e-12)
+        similar = np.triu(embeddings @ embeddings.T >= EMBEDDING_SIMILARITY_THRESHOLD, k=1)
+
+        parent = list(range(len(stories)))
+        for i, j in np.argwhere(similar):
+            # One newsletter rarely covers the same event twice
+            if stories[i].get("source") == stories[j].get("source"):
+                continue
+            parent[_find_root(parent, int(j))] = _find_root(parent, int(i))
+
+        groups: Dict[int, List[int]] = {}
+        for i in range(len(stories)):
+            groups.setdefault(_find_root(parent, i), []).append(i)
+
+        clustered = []
+        for indices in groups.values():
+            leader = dict(stories[indices[0]])
+            if len(indices) > 1:
+                leader["possible_duplicates"] = [stories[i] for i in indices[1:]]
+            clustered.append(leader)
+
+        return clustered
+
+    @staticmethod
+    def _hub_urls(
+        stories: List[Dict[str, Any]], url_keys: List[Optional[str]]
+    ) -> Set[str]:
+        """Find canonical URLs that a single source links from several stories."""
+        seen: Set[tuple] = set()
+        hub_urls: Set[str] = set()
+        for story, url_key in zip(stories, url_keys):
+            if not url_key:
+                continue
+            pair = (story.get("source"), url_key)
+            if pair in seen:
+                hub_urls.add(url_key)
+            seen.add(pair)
+        return hub_urls
+
+    def _reinflate_sources(
+        self,
+        result: Dict[str, Any],
+        stories: List[Dict[str, Any]],
+    ) -> None:
+        """
+        Restore sources of locally merged duplicates on Claude's output.
+
+        Output stories are matched to pre-merged groups by canonical URL, and
+        any group sources Claude dropped are appended (mention_count is raised
+        to match).
+
+        Args:
+            result: Parsed deduplication result, updated in place
+            stories: Pre-clustered stories that were sent to Claude
+        """
+        sources_by_url: Dict[str, Set[str]] = {}
+        groups = itertools.chain.from_iterable(
+            [story, *story.get("possible_duplicates", ())] for story in stories
+        )
+        for story in groups:
+            duplicates = story.get("duplicates")
+            if not duplicates:
+                continue
+            members = [story, *duplicates]
+            sources = {m["source"] for m in members if m.get("source")}
+            for member in members:
+                url_key = _canonical_url(member.get("url"))
+                if url_key:
+                    sources_by_url.setdefault(url_key, set()).update(sources)
+
+        if not sources_by_url:
+            return
+
+        for key in ("top_stories", "secondary_stories"):
+            for story in result.get(key, []):
+                sources = list(story.get("sources") or [])
+                for url in story.get("urls") or []:
+                    for source in sorted(sources_by_url.get(_canonical_url(url), ())):
+                        if source not in sources:
+                            sources.append(source)
+                story["sources"] = sources
+                story["mention_count"] = max(story.get("mention_count", 1), len(sources))
+
+    def _build_system_prompt(self, story_count: int, original_count: int) -> str:
         """Build the system prompt for deduplication and ranking."""
         major_companies = ", ".join(self.config.major_ai_companies)
         top_count = self.config.top_stories_count
 
         return f"""You are an AI assistant helping to deduplicate and rank news stories for a daily AI briefing.
 
-You will receive {story_count} raw news stories extracted from newsletters. You must:
+You will receive {story_count} raw news stories extracted from newsletters. Some stories include a "duplicates" list: these are reports of the same event from other newsletters that were already matched. Treat each duplicate as an additional source for that story (count it in mention_count, include its source and URL, and use its summary when writing the unified summary). Some stories include a "possible_duplicates" list: these look similar but were NOT confirmed as the same event. Merge each one into the story only if it reports the same underlying event; otherwise treat it as a separate story in its own right. You must:
 
 1. DEDUPLICATE:
    - Group overlapping stories that report on the same underlying event
@@ -133,7 +444,7 @@ OUTPUT FORMAT (JSON only):
     {{ "headline": "Headline for lower-priority story" }}
   ],
   "deduplication_summary": {{
-    "original_story_count": {story_count},
+    "original_story_count": {original_count},
     "deduplicated_story_count": 0,
     "stories_merged": 0
   }}
@@ -146,7 +457,7 @@ IMPORTANT:
 
     def _build_user_prompt(self, stories: List[Dict[str, Any]]) -> str:
         """Build the user prompt with all stories."""
-        stories_json = json.dumps(stories, indent=2, ensure_ascii=False)
+        stories_json = _json_dumps(stories)
 
         return f"""Here are the raw news stories to deduplicate and rank:
 
@@ -154,21 +465,24 @@ IMPORTANT:
 
 Please deduplicate, rank, and categorize these stories. Return your response as valid JSON only."""
 
-    def _parse_response(self, response_text: str) -> Dict[str, Any]:
-        """Parse Claude's response and extract result."""
-        # Try to extract JSON from markdown code block
-        json_match = re.search(r"```json\s*(.*?)\s*```", response_text, re.DOTALL)
+    def _parse_response(self, response: bytearray) -> Dict[str, Any]:
+        """Parse Claude's streamed response bytes and extract result."""
+        # Slice out the outermost JSON object (also covers ```json fences)
+        start = response.find(b"{")
+        end = response.rfind(b"}") + 1
+        if start != -1 and end > start:
+            try:
+                return _json_loads(response[start:end])
+            except json.JSONDecodeError:
+                pass
+
+        # Rare fallback: JSON inside a markdown code block with stray braces
+        response_text = response.decode("utf-8", errors="replace")
+        json_match = _JSON_FENCE_RE.search(response_text)
         if json_match:
-            json_text = json_match.group(1)
-        else:
-            # Try to find raw JSON
-            json_match = re.search(r"\{.*\}", response_text, re.DOTALL)
-            if json_match:
-                json_text = json_match.group(0)
-            else:
-                json_text = response_text
-
-        return json.loads(json_text)
+            return _json_loads(json_match.group(1))
+
+        return _json_loads(response_text)
 
     def _empty_result(self) -> Dict[str, Any]:
         """Return empty result structure."""
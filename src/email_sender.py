@@ -1,10 +1,60 @@
 """Email sender for briefings using Gmail API."""
 
+import html
 from pathlib import Path
 from typing import Dict, Optional, Union
 
 from .config import get_config
-from .gmail_client import GmailClient
+from .gmail_client import GmailClient, get_gmail_client
+
+
+# Error notification email bodies; CSS braces are doubled for str.format
+_ERROR_HTML_TEMPLATE = """\
+<!DOCTYPE html>
+<html>
+<head>
+    <style>
+        body {{ font-family: -apple-system, sans-serif; padding: 20px; }}
+        .error-box {{
+            background-color: #fef2f2;
+            border: 1px solid #fecaca;
+            border-radius: 8px;
+            padding: 20px;
+            margin: 20px 0;
+        }}
+        .error-title {{
+            color: #dc2626;
+            font-size: 18px;
+            font-weight: 600;
+            margin: 0 0 12px 0;
+        }}
+        .error-message {{
+            color: #7f1d1d;
+            font-family: monospace;
+            white-space: pre-wrap;
+        }}
+    </style>
+</head>
+<body>
+    <h2>AI Briefing Generation Failed</h2>
+    <div class="error-box">
+        <p class="error-title">Error Details</p>
+        <p class="error-message">{error_message}</p>
+    </div>
+    <p>Please check the GitHub Actions logs for more details.</p>
+</body>
+</html>
+"""
+
+_ERROR_TEXT_TEMPLATE = """
+AI Briefing Generation Failed
+=============================
+
+Error Details:
+{error_message}
+
+Please check the GitHub Actions logs for more details.
+"""
 
 
 class EmailSender:
@@ -15,10 +65,19 @@ class EmailSender:
         Initialize the email sender.
 
         Args:
-            gmail_client: Optional GmailClient instance. Creates new one if not provided.
+            gmail_client: Optional GmailClient instance. Uses the shared client if not provided.
         """
         self.config = get_config()
-        self.gmail = gmail_client or GmailClient()
+        self.gmail = gmail_client or get_gmail_client()
+        self._auth_checked = False
+
+    def _ensure_auth(self) -> None:
+        """Authenticate the Gmail client once if it isn't already."""
+        if self._auth_checked:
+            return
+        if not self.gmail.service:
+            self.gmail.authenticate()
+        self._auth_checked = True
 
     def send_briefing(
         self,
@@ -37,9 +96,7 @@ class EmailSender:
         Returns:
             Sent message metadata from Gmail API
         """
-        # Ensure authenticated
-        if not self.gmail.service:
-            self.gmail.authenticate()
+        self._ensure_auth()
 
         to_email = recipient or self.config.recipient_email
         if not to_email:
@@ -74,9 +131,7 @@ class EmailSender:
         Returns:
             Sent message metadata from Gmail API
         """
-        # Ensure authenticated
-        if not self.gmail.service:
-            self.gmail.authenticate()
+        self._ensure_auth()
 
         to_email = recipient or self.config.recipient_email
         if not to_email:
@@ -84,52 +139,11 @@ class EmailSender:
 
         subject = f"{self.config.subject_prefix} ERROR - Briefing Failed"
 
-        html_body = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <style>
-                body {{ font-family: -apple-system, sans-serif; padding: 20px; }}
-                .error-box {{
-                    background-color: #fef2f2;
-                    border: 1px solid #fecaca;
-                    border-radius: 8px;
-                    padding: 20px;
-                    margin: 20px 0;
-                }}
-                .error-title {{
-                    color: #dc2626;
-                    font-size: 18px;
-                    font-weight: 600;
-                    margin: 0 0 12px 0;
-                }}
-                .error-message {{
-                    color: #7f1d1d;
-                    font-family: monospace;
-                    white-space: pre-wrap;
-                }}
-            </style>
-        </head>
-        <body>
-            <h2>AI Briefing Generation Failed</h2>
-            <div class="error-box">
-                <p class="error-title">Error Details</p>
-                <p class="error-message">{error_message}</p>
-            </div>
-            <p>Please check the GitHub Actions logs for more details.</p>
-        </body>
-        </html>
-        """
-
-        text_body = f"""
-AI Briefing Generation Failed
-=============================
-
-Error Details:
-{error_message}
+        html_body = _ERROR_HTML_TEMPLATE.format(
+            error_message=html.escape(error_message),
+        )
 
-Please check the GitHub Actions logs for more details.
-        """
+        text_body = _ERROR_TEXT_TEMPLATE.format(error_message=error_message)
 
         print(f"Sending error notification to {to_email}...")
 
@@ -1,29 +1,58 @@
 """Gmail API client for fetching newsletters and sending emails."""
 
 import base64
+import io
 import json
 import os
 import pickle
+import random
 import re
-from datetime import datetime, timedelta
-from email import encoders
-from email.mime.audio import MIMEAudio
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
 from email.mime.base import MIMEBase
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
+import httplib2
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
+from google_auth_httplib2 import AuthorizedHttp
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
+from googleapiclient.http import MediaInMemoryUpload
+from googleapiclient.model import JsonModel
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    FAST_HTML_PARSING_AVAILABLE = True
+except ImportError:
+    FAST_HTML_PARSING_AVAILABLE = False
 
 try:
     from bs4 import BeautifulSoup
-    HTML_PARSING_AVAILABLE = True
+    BS4_AVAILABLE = True
+except ImportError:
+    BS4_AVAILABLE = False
+
+HTML_PARSING_AVAILABLE = FAST_HTML_PARSING_AVAILABLE or BS4_AVAILABLE
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    HTML_PARSING_AVAILABLE = False
+    ORJSON_AVAILABLE = False
+
+try:
+    import diskcache
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    DISKCACHE_AVAILABLE = False
 
 from .config import get_config
 
@@ -34,6 +63,87 @@ SCOPES = [
     "https://www.googleapis.com/auth/gmail.send",
 ]
 
+# Gmail accepts up to 100 calls per batch HTTP request; full messages are
+# batched more conservatively since oversized batches risk timeouts
+METADATA_BATCH_SIZE = 100
+FULL_MESSAGE_BATCH_SIZE = 25
+
+# Parallel individual gets, used when a batch request fails as a whole.
+# messages.get costs 5 quota units, so 8 workers stay well under the
+# 250 units/sec per-user limit.
+MAX_FETCH_WORKERS = 8
+
+# Per-request retry for rate limiting (429) and transient server errors.
+# Sends are not idempotent, so they only retry statuses that mean the
+# request was turned away before being processed.
+RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+SEND_RETRYABLE_STATUS_CODES = (429, 503)
+# Dropped connections and socket timeouts surface as these, not HttpError
+RETRYABLE_TRANSPORT_ERRORS = (ConnectionError, TimeoutError, httplib2.HttpLib2Error)
+MAX_REQUEST_ATTEMPTS = 5
+MAX_RETRY_DELAY_SECONDS = 32
+
+# Socket timeout for Gmail API connections (batched full messages are large)
+HTTP_TIMEOUT_SECONDS = 60
+
+# Partial-response masks: only request the parts of each response we read
+LIST_FIELDS = "messages/id,nextPageToken"
+METADATA_FIELDS = "id,payload/headers(name,value)"
+# Full messages: top-level headers plus the MIME tree (type and inline body
+# data only, no per-part headers, filenames or attachment metadata). Parts are
+# masked three levels deep; anything nested deeper is returned whole.
+FULL_MESSAGE_FIELDS = (
+    "id,"
+    "payload(headers(name,value),mimeType,body/data,"
+    "parts(mimeType,body/data,"
+    "parts(mimeType,body/data,"
+    "parts(mimeType,body/data,parts))))"
+)
+
+# Regex fallback for HTML-to-text when no HTML parser is installed
+_SCRIPT_STYLE_RE = re.compile(
+    r"<(script|style)[^>]*>.*?</\1>", re.DOTALL | re.IGNORECASE
+)
+_TAG_RE = re.compile(r"<[^>]+>")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Refresh access tokens this long before they expire so no API call mid-run
+# stalls on an inline refresh
+TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
+
+# Attachments are read and base64-encoded in slices of this many bytes; a
+# multiple of 57 so every slice encodes to whole 76-character MIME lines
+ATTACHMENT_READ_SIZE = 57 * 1024
+
+# Gmail message contents are immutable, so parsed messages can be cached on
+# disk by message ID to spare quota and parsing on reruns (opt-in, since the
+# cache holds message bodies unencrypted). Bump the version whenever the
+# parsed message format changes.
+MESSAGE_CACHE_DIR = ".gmail_msg_cache"
+MESSAGE_CACHE_TTL_SECONDS = 30 * 24 * 60 * 60
+MESSAGE_CACHE_VERSION = 1
+
+
+def _json_loads(data: Union[str, bytes]) -> Any:
+    """Parse JSON, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class FastJsonModel(JsonModel):
+    """JsonModel that parses API responses straight from bytes with orjson."""
+
+    def deserialize(self, content):
+        try:
+            body = _json_loads(content)
+        except json.JSONDecodeError:
+            # orjson's error subclasses json's; let JsonModel handle odd bodies
+            return super().deserialize(content)
+        if self._data_wrapper and isinstance(body, dict) and "data" in body:
+            body = body["data"]
+        return body
+
 
 class GmailClient:
     """Gmail API client for reading newsletters and sending briefings."""
@@ -42,8 +152,14 @@ class GmailClient:
         """Initialize the Gmail client."""
         self.config = get_config()
         self.service = None
+        self._credentials = None
+        # One keep-alive HTTP connection reused by every API call
+        self._http = httplib2.Http(timeout=HTTP_TIMEOUT_SECONDS)
         self._credentials_dir = Path(".gmail_credentials")
         self._credentials_dir.mkdir(exist_ok=True)
+        self._cache = None
+        if self.config.gmail_cache_messages and DISKCACHE_AVAILABLE:
+            self._cache = diskcache.Cache(MESSAGE_CACHE_DIR)
 
     def authenticate(self) -> None:
         """
@@ -60,7 +176,7 @@ class GmailClient:
             token_json = self.config.gmail_token_json
             if token_json:
                 try:
-                    token_data = json.loads(base64.b64decode(token_json))
+                    token_data = _json_loads(base64.b64decode(token_json))
                     creds = Credentials(
                         token=token_data.get("token"),
                         refresh_token=token_data.get("refresh_token"),
@@ -76,9 +192,9 @@ class GmailClient:
             # Local development: Try MCP token first, then standard OAuth
             creds = self._load_local_credentials()
 
-        # Refresh if needed
-        if creds and creds.expired and creds.refresh_token:
-            print("Refreshing expired token...")
+        # Refresh if expired or close to expiring
+        if creds and creds.refresh_token and self._needs_refresh(creds):
+            print("Refreshing access token...")
             creds.refresh(Request())
             self._save_credentials(creds)
 
@@ -88,10 +204,34 @@ class GmailClient:
             # Local: Run OAuth flow
             creds = self._run_oauth_flow()
 
-        # Build Gmail API service
-        self.service = build("gmail", "v1", credentials=creds)
+        # Build Gmail API service from the discovery document bundled with
+        # google-api-python-client (no discovery HTTP fetch), decoding
+        # responses with orjson when it is installed
+        self._credentials = creds
+        self.service = build(
+            "gmail",
+            "v1",
+            http=AuthorizedHttp(creds, http=self._http),
+            model=FastJsonModel() if ORJSON_AVAILABLE else None,
+            static_discovery=True,
+            cache_discovery=False,
+        )
         print("[OK] Authenticated with Gmail API")
 
+    @staticmethod
+    def _needs_refresh(creds: Credentials) -> bool:
+        """
+        Check if an access token should be refreshed before use.
+
+        Tokens without a known expiry (e.g. loaded from GMAIL_TOKEN_JSON) are
+        refreshed up front rather than failing the first API call with a 401.
+        """
+        if not creds.token or creds.expiry is None:
+            return True
+        # google-auth stores expiry as naive UTC
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        return creds.expiry - now < TOKEN_REFRESH_MARGIN
+
     def _load_local_credentials(self) -> Optional[Credentials]:
         """Load credentials for local development."""
         creds = None
@@ -100,8 +240,8 @@ class GmailClient:
         mcp_token_path = Path.home() / ".gmail-mcp" / "gmail-token.json"
         if mcp_token_path.exists():
             try:
-                with open(mcp_token_path, "r") as f:
-                    token_data = json.load(f)
+                with open(mcp_token_path, "rb") as f:
+                    token_data = _json_loads(f.read())
                 creds = Credentials(
                     token=token_data.get("token"),
                     refresh_token=token_data.get("refresh_token"),
@@ -144,6 +284,53 @@ class GmailClient:
         with open(token_path, "wb") as token:
             pickle.dump(creds, token)
 
+    def _execute_with_retry(self, request, http=None, idempotent: bool = True):
+        """
+        Execute an API request, retrying transient failures.
+
+        Retries rate limiting, 5xx responses and transport errors with
+        exponential backoff and jitter, honoring the Retry-After header when
+        present. Non-idempotent requests only retry 429/503, since a 5xx or
+        dropped connection may come after the request already took effect.
+
+        Args:
+            request: HttpRequest or BatchHttpRequest to execute
+            http: Optional HTTP object to execute the request with
+            idempotent: Whether the request is safe to repeat
+
+        Returns:
+            The request's response
+        """
+        for attempt in range(MAX_REQUEST_ATTEMPTS):
+            try:
+                return request.execute(http=http)
+            except (HttpError, *RETRYABLE_TRANSPORT_ERRORS) as e:
+                if not self._is_retryable(e, idempotent) or attempt == MAX_REQUEST_ATTEMPTS - 1:
+                    raise
+                delay = self._retry_delay(e, attempt)
+                if isinstance(e, HttpError):
+                    print(f"  [RETRY] Gmail API returned {e.resp.status}, waiting {delay:.1f}s...")
+                else:
+                    print(f"  [RETRY] Gmail API request failed ({e}), waiting {delay:.1f}s...")
+                time.sleep(delay)
+
+    @staticmethod
+    def _is_retryable(error: Exception, idempotent: bool = True) -> bool:
+        """Check if an API error is worth retrying."""
+        if isinstance(error, HttpError):
+            codes = RETRYABLE_STATUS_CODES if idempotent else SEND_RETRYABLE_STATUS_CODES
+            return error.resp.status in codes
+        return idempotent and isinstance(error, RETRYABLE_TRANSPORT_ERRORS)
+
+    @staticmethod
+    def _retry_delay(error: Exception, attempt: int) -> float:
+        """Get the delay before retrying, preferring the server's Retry-After."""
+        if isinstance(error, HttpError):
+            retry_after = error.resp.get("retry-after", "")
+            if retry_after.isdigit():
+                return min(float(retry_after), MAX_RETRY_DELAY_SECONDS)
+        return min(2 ** attempt + random.uniform(0, 1), MAX_RETRY_DELAY_SECONDS)
+
     def search_newsletters(
         self,
         sender_emails: List[str],
@@ -178,7 +365,7 @@ class GmailClient:
         page_token = None
 
         while len(results) < max_results:
-            response = (
+            response = self._execute_with_retry(
                 self.service.users()
                 .messages()
                 .list(
@@ -186,26 +373,28 @@ class GmailClient:
                     q=query,
                     maxResults=min(100, max_results - len(results)),
                     pageToken=page_token,
+                    fields=LIST_FIELDS,
                 )
-                .execute()
             )
 
             messages = response.get("messages", [])
             if not messages:
                 break
 
-            for msg in messages:
-                metadata = (
-                    self.service.users()
-                    .messages()
-                    .get(
-                        userId="me",
-                        id=msg["id"],
-                        format="metadata",
-                        metadataHeaders=["From", "Subject", "Date"],
-                    )
-                    .execute()
-                )
+            # Fetch metadata for the whole page in batched HTTP calls
+            message_ids = [msg["id"] for msg in messages]
+            metadata_by_id = self._batch_get_messages(
+                message_ids,
+                batch_size=METADATA_BATCH_SIZE,
+                format="metadata",
+                metadataHeaders=["From", "Subject", "Date"],
+                fields=METADATA_FIELDS,
+            )
+
+            for message_id in message_ids:
+                metadata = metadata_by_id.get(message_id)
+                if metadata is None:
+                    continue
 
                 headers = {
                     h["name"]: h["value"]
@@ -213,7 +402,7 @@ class GmailClient:
                 }
 
                 results.append({
-                    "id": msg["id"],
+                    "id": message_id,
                     "from": headers.get("From", ""),
                     "subject": headers.get("Subject", ""),
                     "date": headers.get("Date", ""),
@@ -226,6 +415,128 @@ class GmailClient:
         print(f"[OK] Found {len(results)} newsletters")
         return results
 
+    def _batch_get_messages(
+        self,
+        message_ids: List[str],
+        batch_size: int,
+        **get_kwargs,
+    ) -> Dict[str, Dict]:
+        """
+        Fetch messages with batched messages.get calls.
+
+        Args:
+            message_ids: Gmail message IDs to fetch
+            batch_size: Maximum number of gets per batch HTTP request
+            **get_kwargs: Extra arguments for messages.get (format, etc.)
+
+        Returns:
+            Dictionary mapping message ID to API response. Messages that
+            failed to fetch are logged and omitted.
+        """
+        responses: Dict[str, Dict] = {}
+        retry_errors: Dict[str, HttpError] = {}
+
+        def on_response(request_id: str, response: Dict, exception) -> None:
+            if exception is None:
+                responses[request_id] = response
+            elif self._is_retryable(exception):
+                retry_errors[request_id] = exception
+            else:
+                print(f"  [ERROR] Failed to fetch message {request_id}: {exception}")
+
+        for start in range(0, len(message_ids), batch_size):
+            pending = message_ids[start:start + batch_size]
+
+            for attempt in range(MAX_REQUEST_ATTEMPTS):
+                retry_errors.clear()
+                batch = self.service.new_batch_http_request(callback=on_response)
+                for message_id in pending:
+                    batch.add(
+                        self.service.users().messages().get(
+                            userId="me", id=message_id, **get_kwargs
+                        ),
+                        request_id=message_id,
+                    )
+                try:
+                    self._execute_with_retry(batch)
+                except Exception as e:
+                    print(f"  [WARNING] Batch request failed ({e}), fetching individually...")
+                    missing_ids = [mid for mid in pending if mid not in responses]
+                    responses.update(
+                        self._get_messages_concurrently(missing_ids, **get_kwargs)
+                    )
+                    break
+
+                if not retry_errors:
+                    break
+
+                # Re-batch only the items that were rate limited
+                pending = list(retry_errors)
+                if attempt < MAX_REQUEST_ATTEMPTS - 1:
+                    delay = max(
+                        self._retry_delay(error, attempt)
+                        for error in retry_errors.values()
+                    )
+                    print(f"  [RETRY] {len(pending)} messages rate limited, waiting {delay:.1f}s...")
+                    time.sleep(delay)
+            else:
+                for message_id, error in retry_errors.items():
+                    print(f"  [ERROR] Failed to fetch message {message_id}: {error}")
+
+        return responses
+
+    def _get_messages_concurrently(
+        self,
+        message_ids: List[str],
+        **get_kwargs,
+    ) -> Dict[str, Dict]:
+        """
+        Fetch messages with parallel individual messages.get calls.
+
+        httplib2 connections are not thread-safe, so each worker thread uses
+        its own authorized HTTP object.
+
+        Args:
+            message_ids: Gmail message IDs to fetch
+            **get_kwargs: Extra arguments for messages.get (format, etc.)
+
+        Returns:
+            Dictionary mapping message ID to API response. Messages that
+            failed to fetch are logged and omitted.
+        """
+        local = threading.local()
+
+        def fetch(message_id: str) -> Dict:
+            if not hasattr(local, "http"):
+                local.http = AuthorizedHttp(
+                    self._credentials,
+                    http=httplib2.Http(timeout=HTTP_TIMEOUT_SECONDS),
+                )
+            request = self.service.users().messages().get(
+                userId="me", id=message_id, **get_kwargs
+            )
+            return self._execute_with_retry(request, http=local.http)
+
+        responses: Dict[str, Dict] = {}
+        if not message_ids:
+            return responses
+
+        # No idle threads (and their HTTP connections) for small fallbacks
+        workers = min(len(message_ids), MAX_FETCH_WORKERS)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(fetch, message_id): message_id
+                for message_id in message_ids
+            }
+            for future in as_completed(futures):
+                message_id = futures[future]
+                try:
+                    responses[message_id] = future.result()
+                except Exception as e:
+                    print(f"  [ERROR] Failed to fetch message {message_id}: {e}")
+
+        return responses
+
     def get_email_text(self, message_id: str) -> Dict:
         """
         Get email metadata and plain text content.
@@ -239,14 +550,84 @@ class GmailClient:
         if not self.service:
             raise RuntimeError("Not authenticated. Call authenticate() first.")
 
+        cached = self._cache_get(message_id)
+        if cached is not None:
+            return cached
+
         # Get full message
-        message = (
+        message = self._execute_with_retry(
             self.service.users()
             .messages()
-            .get(userId="me", id=message_id, format="full")
-            .execute()
+            .get(userId="me", id=message_id, format="full", fields=FULL_MESSAGE_FIELDS)
         )
 
+        email = self._parse_message(message_id, message)
+        self._cache_set(message_id, email)
+        return email
+
+    def get_emails_text_batch(self, message_ids: List[str]) -> List[Dict]:
+        """
+        Get metadata and plain text content for several emails.
+
+        Messages already in the local cache are served from it; the rest
+        are fetched with batched HTTP requests, in smaller batches than
+        metadata since full payloads are large.
+
+        Args:
+            message_ids: Gmail message IDs
+
+        Returns:
+            List of email dictionaries (see get_email_text) in the order of
+            message_ids. Messages that failed to fetch are omitted.
+        """
+        if not self.service:
+            raise RuntimeError("Not authenticated. Call authenticate() first.")
+
+        emails_by_id = {}
+        for message_id in message_ids:
+            cached = self._cache_get(message_id)
+            if cached is not None:
+                emails_by_id[message_id] = cached
+
+        missing_ids = [m for m in message_ids if m not in emails_by_id]
+        if missing_ids:
+            messages_by_id = self._batch_get_messages(
+                missing_ids,
+                batch_size=FULL_MESSAGE_BATCH_SIZE,
+                format="full",
+                fields=FULL_MESSAGE_FIELDS,
+            )
+            for message_id, message in messages_by_id.items():
+                email = self._parse_message(message_id, message)
+                self._cache_set(message_id, email)
+                emails_by_id[message_id] = email
+
+        return [
+            emails_by_id[message_id]
+            for message_id in message_ids
+            if message_id in emails_by_id
+        ]
+
+    def _cache_get(self, message_id: str) -> Optional[Dict]:
+        """Return a previously parsed message from the disk cache, if any."""
+        if self._cache is None:
+            return None
+        return self._cache.get(self._cache_key(message_id))
+
+    def _cache_set(self, message_id: str, email: Dict) -> None:
+        """Store a parsed message in the disk cache."""
+        if self._cache is not None:
+            self._cache.set(
+                self._cache_key(message_id), email, expire=MESSAGE_CACHE_TTL_SECONDS
+            )
+
+    @staticmethod
+    def _cache_key(message_id: str) -> str:
+        """Build the disk cache key for a message."""
+        return f"v{MESSAGE_CACHE_VERSION}:{message_id}"
+
+    def _parse_message(self, message_id: str, message: Dict) -> Dict:
+        """Extract headers and plain text from a full Gmail message."""
         # Extract headers
         headers = {
             h["name"]: h["value"]
@@ -266,42 +647,54 @@ class GmailClient:
 
     def _extract_text_from_payload(self, payload: Dict) -> str:
         """Extract plain text from email payload."""
-        text_parts = []
+        plain_text = io.StringIO()
         html_parts = []
+        pending = deque([payload])
 
-        def extract_recursive(p: Dict) -> None:
+        # Iterative depth-first walk in document order
+        while pending:
+            p = pending.popleft()
             mime_type = p.get("mimeType", "")
 
             if mime_type == "text/plain":
                 body_data = p.get("body", {}).get("data", "")
                 if body_data:
-                    decoded = base64.urlsafe_b64decode(body_data).decode(
-                        "utf-8", errors="ignore"
+                    if plain_text.tell():
+                        plain_text.write("\n\n")
+                    plain_text.write(
+                        base64.urlsafe_b64decode(body_data).decode(
+                            "utf-8", errors="ignore"
+                        )
                     )
-                    text_parts.append(decoded)
 
             elif mime_type == "text/html":
+                # Keep HTML encoded; it's only decoded if no plain text turns up
                 body_data = p.get("body", {}).get("data", "")
-                if body_data:
-                    decoded = base64.urlsafe_b64decode(body_data).decode(
-                        "utf-8", errors="ignore"
-                    )
-                    html_parts.append(decoded)
+                if body_data and not plain_text.tell() and HTML_PARSING_AVAILABLE:
+                    html_parts.append(body_data)
 
             elif mime_type.startswith("multipart/"):
-                for part in p.get("parts", []):
-                    extract_recursive(part)
-
-        extract_recursive(payload)
+                parts = p.get("parts", [])
+                if mime_type == "multipart/alternative":
+                    # Alternatives carry the same content, so only walk the
+                    # plain-text one when it exists
+                    plain_parts = [
+                        part for part in parts
+                        if part.get("mimeType") == "text/plain"
+                        and part.get("body", {}).get("data")
+                    ]
+                    parts = plain_parts[:1] or parts
+                pending.extendleft(reversed(parts))
 
         # Prefer plain text
-        if text_parts:
-            return "\n\n".join(text_parts)
+        if plain_text.tell():
+            return plain_text.getvalue()
 
         # Fall back to HTML conversion
-        if html_parts and HTML_PARSING_AVAILABLE:
+        if html_parts:
             converted = []
-            for html in html_parts:
+            for body_data in html_parts:
+                html = base64.urlsafe_b64decode(body_data).decode("utf-8", errors="ignore")
                 text = self._html_to_text(html)
                 if text:
                     converted.append(text)
@@ -313,23 +706,25 @@ class GmailClient:
         """Convert HTML to plain text."""
         if not HTML_PARSING_AVAILABLE:
             # Fallback: regex-based stripping
-            text = re.sub(
-                r"<style[^>]*>.*?</style>", "", html, flags=re.DOTALL | re.IGNORECASE
-            )
-            text = re.sub(
-                r"<script[^>]*>.*?</script>", "", text, flags=re.DOTALL | re.IGNORECASE
-            )
-            text = re.sub(r"<[^>]+>", "", text)
-            text = re.sub(r"\s+", " ", text)
+            text = _SCRIPT_STYLE_RE.sub("", html)
+            text = _TAG_RE.sub("", text)
+            text = _WHITESPACE_RE.sub(" ", text)
             return text.strip()
 
-        soup = BeautifulSoup(html, "html.parser")
+        if FAST_HTML_PARSING_AVAILABLE:
+            # selectolax (lexbor C parser) is much faster than BeautifulSoup
+            tree = LexborHTMLParser(html)
+            tree.strip_tags(["script", "style", "head", "meta", "link"])
+            text = tree.body.text(separator="\n") if tree.body else ""
+        else:
+            soup = BeautifulSoup(html, "html.parser")
+
+            # Remove script and style elements
+            for element in soup(["script", "style", "head", "meta", "link"]):
+                element.decompose()
 
-        # Remove script and style elements
-        for element in soup(["script", "style", "head", "meta", "link"]):
-            element.decompose()
+            text = soup.get_text(separator="\n")
 
-        text = soup.get_text(separator="\n")
         lines = [line.strip() for line in text.splitlines()]
         lines = [line for line in lines if line]
         return "\n".join(lines)
@@ -369,28 +764,7 @@ class GmailClient:
             message.attach(body_part)
 
             # Add the attachment
-            attachment_path = Path(attachment_path)
-            if attachment_path.suffix.lower() == ".mp3":
-                with open(attachment_path, "rb") as f:
-                    audio_part = MIMEAudio(f.read(), _subtype="mpeg")
-                audio_part.add_header(
-                    "Content-Disposition",
-                    "attachment",
-                    filename=attachment_path.name,
-                )
-                message.attach(audio_part)
-            else:
-                # Generic attachment
-                with open(attachment_path, "rb") as f:
-                    part = MIMEBase("application", "octet-stream")
-                    part.set_payload(f.read())
-                encoders.encode_base64(part)
-                part.add_header(
-                    "Content-Disposition",
-                    "attachment",
-                    filename=attachment_path.name,
-                )
-                message.attach(part)
+            message.attach(self._build_attachment(Path(attachment_path)))
         else:
             # Simple alternative message without attachment
             message = MIMEMultipart("alternative")
@@ -401,13 +775,71 @@ class GmailClient:
         message["to"] = to
         message["subject"] = subject
 
-        # Encode and send
-        raw = base64.urlsafe_b64encode(message.as_bytes()).decode()
-        body = {"raw": raw}
+        # Upload the RFC 822 message as-is rather than base64-wrapping it into
+        # a JSON "raw" field; resumable uploads keep large attachments robust
+        media = MediaInMemoryUpload(
+            message.as_bytes(),
+            mimetype="message/rfc822",
+            resumable=bool(attachment_path),
+        )
 
-        sent_message = (
-            self.service.users().messages().send(userId="me", body=body).execute()
+        sent_message = self._execute_with_retry(
+            self.service.users().messages().send(userId="me", body={}, media_body=media),
+            idempotent=False,
         )
 
         print(f"[OK] Email sent to {to}")
         return sent_message
+
+    @staticmethod
+    def _build_attachment(attachment_path: Path) -> MIMEBase:
+        """
+        Build a base64-encoded MIME attachment part, reading the file in slices.
+
+        Encoding slice by slice means the raw file bytes are never held in
+        memory next to their base64 copy.
+
+        Args:
+            attachment_path: Path to the file to attach
+
+        Returns:
+            MIME part ready to attach to a message
+        """
+        if attachment_path.suffix.lower() == ".mp3":
+            part = MIMEBase("audio", "mpeg")
+        else:
+            part = MIMEBase("application", "octet-stream")
+
+        encoded = []
+        with open(attachment_path, "rb") as f:
+            while block := f.read(ATTACHMENT_READ_SIZE):
+                encoded.append(base64.encodebytes(block).decode("ascii"))
+
+        part.set_payload("".join(encoded))
+        part["Content-Transfer-Encoding"] = "base64"
+        part.add_header(
+            "Content-Disposition",
+            "attachment",
+            filename=attachment_path.name,
+        )
+        return part
+
+
+# Global client instance
+_gmail_client: Optional[GmailClient] = None
+
+
+def get_gmail_client() -> GmailClient:
+    """
+    Get the global, authenticated Gmail client.
+
+    Authentication (and building the API service) happens once per process;
+    later callers such as the error-notification path reuse the same
+    credentials and HTTP connection.
+    """
+    global _gmail_client
+    if _gmail_client is None:
+        client = GmailClient()
+        client.authenticate()
+        _gmail_client = client
+    return _gmail_client
@@ -6,50 +6,63 @@ Fetches newsletters from Gmail, extracts stories using Claude,
 deduplicates and ranks, generates audio podcast, then sends a formatted briefing email.
 """
 
+import logging
 import sys
-import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from .config import get_config
-from .gmail_client import GmailClient
-from .newsletter_parser import NewsletterParser
-from .deduplicator import Deduplicator
-from .briefing_generator import BriefingGenerator
-from .email_sender import EmailSender
 
 
-def retry_with_backoff(func, max_attempts: int = 3, base_delay: int = 5):
+def generate_audio(
+    processed_data: Dict[str, Any],
+    newsletters_processed: List[str],
+    today: Optional[datetime] = None,
+) -> Optional[Path]:
     """
-    Retry a function with exponential backoff.
+    Generate the audio podcast for a briefing.
+
+    Failures are logged and swallowed so the briefing can still be sent.
 
     Args:
-        func: Function to call
-        max_attempts: Maximum number of attempts
-        base_delay: Base delay in seconds
+        processed_data: Output from deduplicator with ranked stories
+        newsletters_processed: List of newsletter names that were processed
+        today: Briefing date (default: now)
 
     Returns:
-        Function result
-
-    Raises:
-        Last exception if all attempts fail
+        Path to the generated MP3, or None if generation failed
     """
-    last_exception = None
+    try:
+        from .audio import ScriptGenerator, TTSClient
 
-    for attempt in range(max_attempts):
-        try:
-            return func()
-        except Exception as e:
-            last_exception = e
-            if attempt < max_attempts - 1:
-                delay = base_delay * (2 ** attempt)
-                print(f"[RETRY] Attempt {attempt + 1} failed: {e}")
-                print(f"[RETRY] Waiting {delay} seconds before retry...")
-                time.sleep(delay)
+        script_gen = ScriptGenerator()
+        tts_client = TTSClient()
 
-    raise last_exception
+        # Generate script (sections are synthesized as parallel chunks)
+        script_sections = script_gen.generate_sections(
+            processed_data=processed_data,
+            newsletters_processed=newsletters_processed,
+            today=today,
+        )
+        script = "\n\n".join(script_sections)
+
+        # Estimate duration
+        duration_mins = tts_client.estimate_duration(script)
+        char_count = tts_client.get_character_count(script)
+        print(f"  Script: {char_count} characters, ~{duration_mins:.1f} min")
+
+        # Generate audio
+        audio_path = Path("briefing_audio.mp3")
+
+        # Transient API errors are retried per chunk by the TTS session
+        return tts_client.generate_audio(script_sections, audio_path)
+    except Exception as e:
+        print(f"  [WARNING] Audio generation failed: {e}")
+        print("  [WARNING] Continuing without audio...")
+        return None
 
 
 def run_pipeline() -> Dict[str, Any]:
@@ -59,6 +72,14 @@ def run_pipeline() -> Dict[str, Any]:
     Returns:
         Dictionary with pipeline results and metadata
     """
+    # Pipeline components pull in the Google, Anthropic and Jinja2 SDKs, so
+    # they are imported here rather than at module load
+    from .briefing_generator import BriefingGenerator
+    from .deduplicator import Deduplicator
+    from .email_sender import EmailSender
+    from .gmail_client import get_gmail_client
+    from .newsletter_parser import NewsletterParser
+
     config = get_config()
     start_time = datetime.now()
 
@@ -68,35 +89,28 @@ def run_pipeline() -> Dict[str, Any]:
     print("=" * 60)
 
     # Initialize components
-    gmail_client = GmailClient()
     parser = NewsletterParser()
-    deduplicator = Deduplicator()
+    # Share one Anthropic client (and its connection pool) across components
+    deduplicator = Deduplicator(client=parser.client)
     generator = BriefingGenerator()
-    sender = EmailSender(gmail_client)
 
     # Determine total steps (6 if audio enabled, 5 otherwise)
     total_steps = 6 if config.audio_enabled else 5
 
     # Step 1: Authenticate with Gmail
     print(f"\n[1/{total_steps}] Authenticating with Gmail...")
-    gmail_client.authenticate()
+    gmail_client = get_gmail_client()
+    sender = EmailSender(gmail_client)
 
     # Step 2: Fetch newsletters
     print(f"\n[2/{total_steps}] Fetching newsletters from the past day...")
     newsletter_emails = config.newsletter_emails
 
-    def fetch_newsletters():
-        emails = gmail_client.search_newsletters(
-            sender_emails=newsletter_emails,
-            days_back=1,
-            max_results=20,
-        )
-        return emails
-
-    email_list = retry_with_backoff(
-        fetch_newsletters,
-        max_attempts=config.max_retry_attempts,
-        base_delay=config.retry_base_delay,
+    # Rate-limited Gmail requests are retried individually by the client
+    email_list = gmail_client.search_newsletters(
+        sender_emails=newsletter_emails,
+        days_back=1,
+        max_results=20,
     )
 
     if not email_list:
@@ -111,21 +125,14 @@ def run_pipeline() -> Dict[str, Any]:
 
     # Fetch full text for each newsletter
     print(f"\n[2/{total_steps}] Fetching text from {len(email_list)} newsletters...")
-    newsletters = []
-    newsletters_processed = []
+    newsletters = gmail_client.get_emails_text_batch(
+        [email["id"] for email in email_list]
+    )
 
-    for i, email in enumerate(email_list, 1):
-        try:
-            # Safely encode subject for Windows console (replace emojis with ?)
-            subject_preview = email["subject"][:40].encode("ascii", "replace").decode("ascii")
-            print(f"  [{i}/{len(email_list)}] Fetching: {subject_preview}...")
-            email_data = gmail_client.get_email_text(email["id"])
-            newsletters.append(email_data)
-            source_name = config.get_source_name(email["from"])
-            if source_name not in newsletters_processed:
-                newsletters_processed.append(source_name)
-        except Exception as e:
-            print(f"  [ERROR] Failed to fetch email: {e}")
+    # Unique source names in first-seen order (dict keys keep insertion order)
+    newsletters_processed = list(dict.fromkeys(
+        config.get_source_name(email_data["from"]) for email_data in newsletters
+    ))
 
     print(f"[OK] Fetched {len(newsletters)} newsletters")
 
@@ -141,14 +148,9 @@ def run_pipeline() -> Dict[str, Any]:
     # Step 3: Extract stories
     print(f"\n[3/{total_steps}] Extracting stories with Claude API...")
 
-    def extract_stories():
-        return parser.extract_stories(newsletters)
-
-    raw_stories = retry_with_backoff(
-        extract_stories,
-        max_attempts=config.max_retry_attempts,
-        base_delay=config.retry_base_delay,
-    )
+    # Failed Claude calls are retried per newsletter by the Anthropic client,
+    # so one bad request doesn't redo every other newsletter
+    raw_stories = parser.extract_stories(newsletters)
 
     print(f"[OK] Extracted {len(raw_stories)} raw stories")
 
@@ -165,70 +167,34 @@ def run_pipeline() -> Dict[str, Any]:
     # Step 4: Deduplicate and rank
     print(f"\n[4/{total_steps}] Deduplicating and ranking stories...")
 
-    def deduplicate():
-        return deduplicator.process(raw_stories)
+    processed_data = deduplicator.process(raw_stories)
 
-    processed_data = retry_with_backoff(
-        deduplicate,
-        max_attempts=config.max_retry_attempts,
-        base_delay=config.retry_base_delay,
-    )
-
-    # Step 5: Generate audio (if enabled)
-    audio_path = None
-    if config.audio_enabled:
-        print(f"\n[5/{total_steps}] Generating audio podcast...")
-        try:
-            from .audio import ScriptGenerator, TTSClient
-
-            script_gen = ScriptGenerator()
-            tts_client = TTSClient()
-
-            # Generate script
-            script = script_gen.generate(
-                processed_data=processed_data,
-                newsletters_processed=newsletters_processed,
-            )
-
-            # Estimate duration
-            duration_mins = tts_client.estimate_duration(script)
-            char_count = tts_client.get_character_count(script)
-            print(f"  Script: {char_count} characters, ~{duration_mins:.1f} min")
-
-            # Generate audio
-            audio_path = Path("briefing_audio.mp3")
-
-            def generate_audio():
-                return tts_client.generate_audio(script, audio_path)
-
-            audio_path = retry_with_backoff(
+    # Steps 5-6: Generate audio in the background while rendering the briefing
+    final_step = total_steps
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        audio_future = None
+        if config.audio_enabled:
+            print(f"\n[5/{total_steps}] Generating audio podcast (in background)...")
+            audio_future = executor.submit(
                 generate_audio,
-                max_attempts=config.max_retry_attempts,
-                base_delay=config.retry_base_delay,
+                processed_data,
+                newsletters_processed,
+                start_time,
             )
-        except Exception as e:
-            print(f"  [WARNING] Audio generation failed: {e}")
-            print("  [WARNING] Continuing without audio...")
-            audio_path = None
 
-    # Step 6: Generate and send briefing
-    final_step = total_steps
-    print(f"\n[{final_step}/{total_steps}] Generating and sending briefing...")
+        print(f"\n[{final_step}/{total_steps}] Generating and sending briefing...")
 
-    briefing = generator.generate(
-        processed_data=processed_data,
-        newsletters_processed=newsletters_processed,
-    )
+        briefing = generator.generate(
+            processed_data=processed_data,
+            newsletters_processed=newsletters_processed,
+            today=start_time,
+        )
 
-    # Send the briefing (with audio if available)
-    def send_email():
-        return sender.send_briefing(briefing, audio_path=audio_path)
+        audio_path = audio_future.result() if audio_future else None
 
-    sent_result = retry_with_backoff(
-        send_email,
-        max_attempts=config.max_retry_attempts,
-        base_delay=config.retry_base_delay,
-    )
+    # Send the briefing (with audio if available). The Gmail client retries
+    # the send itself, only where a retry can't deliver a duplicate.
+    sent_result = sender.send_briefing(briefing, audio_path=audio_path)
 
     # Clean up audio file
     if audio_path and audio_path.exists():
@@ -270,6 +236,13 @@ def main():
     """Main entry point with error handling."""
     config = get_config()
 
+    # Module loggers print plain progress lines, like the rest of the pipeline
+    logging.basicConfig(
+        level=logging.DEBUG if config.debug else logging.INFO,
+        format="%(message)s",
+        stream=sys.stdout,
+    )
+
     try:
         result = run_pipeline()
 
@@ -286,9 +259,10 @@ def main():
 
         # Try to send error notification
         try:
-            gmail_client = GmailClient()
-            gmail_client.authenticate()
-            sender = EmailSender(gmail_client)
+            from .email_sender import EmailSender
+            from .gmail_client import get_gmail_client
+
+            sender = EmailSender(get_gmail_client())
             sender.send_error_notification(error_msg)
             print("[OK] Error notification sent")
         except Exception as notify_error:
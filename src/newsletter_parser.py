@@ -1,41 +1,140 @@
 """Newsletter parser using Claude API to extract news stories."""
 
+import asyncio
+import hashlib
+import html
+import itertools
 import json
 import re
+import time
 from datetime import datetime
-from typing import Any, Dict, List
-
-from anthropic import Anthropic
+from email.utils import parsedate_to_datetime
+from functools import cached_property
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import diskcache
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    DISKCACHE_AVAILABLE = False
 
 from .config import get_config
 
+# anthropic pulls in httpx and pydantic, so it is imported on first use
+if TYPE_CHECKING:
+    from anthropic import Anthropic, AsyncAnthropic
+
+
+# JSON extraction from Claude responses: fenced block first, then raw object
+_JSON_BLOCK_RE = re.compile(r"```json\s*(.*?)\s*```", re.DOTALL)
+_RAW_JSON_RE = re.compile(r"\{.*\}", re.DOTALL)
+
+# Cheap pre-filter: newsletters with no news verbs at all but several
+# tutorial/tips markers are skipped without a Claude call
+_NEWS_SIGNAL_RE = re.compile(
+    r"\b(announc|launch|rais(?:ed|es|ing)\b|acquir|releas|partner|valuation|"
+    r"fund(?:ing|ed)\b|unveil|debut|introduc|invest)",
+    re.IGNORECASE,
+)
+_TUTORIAL_MARKER_RE = re.compile(
+    r"\b(how to|tutorial|step[- ]by[- ]step|tip of the day|prompt of the day|"
+    r"guide to|cheat ?sheet|walkthrough)\b",
+    re.IGNORECASE,
+)
+MIN_TUTORIAL_MARKERS = 3
+
+# Extracted stories can be cached on disk by newsletter content hash so reruns
+# on the same day don't pay for the same Claude calls again (opt-in). The key
+# also covers the system prompt and token budget settings; bump the version
+# when the user prompt or the story format changes.
+EXTRACTION_CACHE_DIR = ".extraction_cache"
+EXTRACTION_CACHE_TTL_SECONDS = 24 * 60 * 60
+EXTRACTION_CACHE_VERSION = 1
+
+# Input token budgeting: room reserved for the user prompt wrapper, marker
+# appended to truncated text and how many count/cut rounds to try
+PROMPT_OVERHEAD_TOKENS = 200
+TRUNCATION_MARKER = "\n\n[Content truncated...]"
+MAX_TRUNCATION_ROUNDS = 3
+
+# Short newsletters are packed into shared requests, each wrapped in a
+# <newsletter> tag (overhead per tag, in tokens) and capped per request so
+# the combined response fits in max_tokens
+NEWSLETTER_TAG_OVERHEAD_TOKENS = 100
+MAX_NEWSLETTERS_PER_REQUEST = 4
+
+# How often to check on a submitted Message Batch
+BATCH_POLL_INTERVAL_SECONDS = 15
+
+
+class _UnroutableGroupResponse(Exception):
+    """A multi-newsletter response that can't be split reliably per newsletter."""
+
+
+def _json_loads(text: Union[str, bytes]) -> Any:
+    """
+    Parse JSON, using orjson when available.
+
+    orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers only
+    need to handle the stdlib exception.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(text)
+    return json.loads(text)
+
 
 class NewsletterParser:
     """Extract news stories from newsletter text using Claude API."""
 
-    def __init__(self):
-        """Initialize the parser with Claude client."""
+    def __init__(self, client: Optional["Anthropic"] = None):
+        """
+        Initialize the parser with Claude client.
+
+        Args:
+            client: Optional Anthropic client to share. Creates one if not provided.
+        """
         self.config = get_config()
-        self.client = Anthropic(
-            api_key=self.config.anthropic_api_key,
-            timeout=300.0,
-        )
+        if client is None:
+            from anthropic import Anthropic
+
+            client = Anthropic(
+                api_key=self.config.anthropic_api_key,
+                timeout=300.0,
+                # Per-request retries with backoff on 429/5xx/connection errors
+                max_retries=self.config.max_retry_attempts,
+            )
+        self.client = client
+        self._cache = None
+        if self.config.claude_cache_extractions and DISKCACHE_AVAILABLE:
+            self._cache = diskcache.Cache(EXTRACTION_CACHE_DIR)
 
     def extract_stories(self, newsletters: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Extract news stories from multiple newsletters.
 
+        Newsletters are sent to Claude concurrently, at most
+        config.max_concurrent_claude_calls at a time. With claude.use_batch_api
+        enabled they are submitted as one Message Batch instead (half the token
+        price), falling back to concurrent calls if the batch fails or doesn't
+        finish within claude.batch_timeout_seconds.
+
         Args:
             newsletters: List of newsletter data with text content
 
         Returns:
-            List of extracted story dictionaries
+            List of extracted story dictionaries, in newsletter order
         """
-        all_stories = []
+        to_extract = []
 
         for i, newsletter in enumerate(newsletters, 1):
             # Safely encode for Windows console
-            subject_preview = newsletter["subject"][:50].encode("ascii", "replace").decode("ascii")
+            subject_preview = self._subject_preview(newsletter)
             from_preview = newsletter["from"].encode("ascii", "replace").decode("ascii")
             print(f"\n[{i}/{len(newsletters)}] Extracting stories from: {subject_preview}...")
             print(f"  From: {from_preview}")
@@ -47,53 +146,491 @@ class NewsletterParser:
                 print("  [SKIP] No meaningful text content")
                 continue
 
-            stories = self._extract_from_single(newsletter)
-            print(f"  [OK] Extracted {len(stories)} stories")
-            all_stories.extend(stories)
+            if self._looks_newsless(text):
+                print("  [SKIP] No news signals (tips/tutorial edition)")
+                continue
 
-        return all_stories
+            to_extract.append(newsletter)
 
-    def _extract_from_single(self, newsletter: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Extract stories from a single newsletter."""
-        # Determine source name
-        source_name = self.config.get_source_name(newsletter["from"])
+        if not to_extract:
+            return []
 
-        # Parse date
-        newsletter_date = self._parse_date(newsletter.get("date", ""))
+        # Cache lookups use the original text, so hits skip token counting
+        cache_keys = [self._cache_key(newsletter) for newsletter in to_extract]
+        results: List[Any] = [
+            self._get_cached(newsletter, key) for newsletter, key in zip(to_extract, cache_keys)
+        ]
+        pending = [i for i, cached in enumerate(results) if cached is None]
+
+        if pending:
+            # Truncate very long newsletters to the input token budget
+            misses = []
+            for i in pending:
+                newsletter = to_extract[i]
+                fitted = self._fit_to_token_budget(newsletter["text"])
+                if fitted is not newsletter["text"]:
+                    print(f"  {self._subject_preview(newsletter)}: truncated to fit the input token budget")
+                misses.append({**newsletter, "text": fitted, "cache_key": cache_keys[i]})
+
+            groups = self._pack_newsletters(misses)
+
+            group_results = None
+            if self.config.claude_use_batch_api:
+                group_results = self._extract_all_batch(groups)
+
+            if group_results is None:
+                print(
+                    f"\nWaiting for Claude on {len(pending)} newsletters "
+                    f"({len(groups)} requests)..."
+                )
+                group_results = asyncio.run(self._extract_all_async(groups))
+
+            # Groups keep newsletter order, so flattening lines up with pending
+            per_newsletter = []
+            for group, group_result in zip(groups, group_results):
+                if isinstance(group_result, BaseException):
+                    per_newsletter.extend([group_result] * len(group))
+                else:
+                    per_newsletter.extend(group_result)
+            for i, result in zip(pending, per_newsletter):
+                results[i] = result
+
+        for newsletter, result in zip(to_extract, results):
+            subject_preview = self._subject_preview(newsletter)
+            if isinstance(result, BaseException):
+                print(f"  [ERROR] {subject_preview}: Failed to extract stories: {result}")
+            else:
+                print(f"  [OK] {subject_preview}: Extracted {len(result)} stories")
 
-        # Build prompt
-        system_prompt = self._build_system_prompt()
-        user_prompt = self._build_user_prompt(
-            source_name, newsletter_date, newsletter["subject"], newsletter["text"]
-        )
+        return list(itertools.chain.from_iterable(
+            result for result in results if not isinstance(result, BaseException)
+        ))
+
+    def _pack_newsletters(
+        self, newsletters: List[Dict[str, Any]]
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Greedily pack consecutive newsletters into shared Claude requests.
+
+        A newsletter's UTF-8 size bounds its token count from above, so a
+        group whose sizes add up to the input token budget always fits in one
+        call without counting tokens. Long newsletters end up alone.
+
+        Args:
+            newsletters: Newsletters to extract, in order
+
+        Returns:
+            Groups of newsletters, in order
+        """
+        budget = self._text_token_budget
+        groups: List[List[Dict[str, Any]]] = []
+        current: List[Dict[str, Any]] = []
+        current_size = 0
+
+        for newsletter in newsletters:
+            size = len(newsletter["text"].encode("utf-8")) + NEWSLETTER_TAG_OVERHEAD_TOKENS
+            if current and (
+                current_size + size > budget
+                or len(current) >= MAX_NEWSLETTERS_PER_REQUEST
+            ):
+                groups.append(current)
+                current = []
+                current_size = 0
+            current.append(newsletter)
+            current_size += size
+
+        if current:
+            groups.append(current)
+
+        return groups
+
+    async def _extract_all_async(
+        self, groups: List[List[Dict[str, Any]]]
+    ) -> List[Union[List[List[Dict[str, Any]]], BaseException]]:
+        """
+        Extract stories from all newsletter groups with concurrent Claude calls.
 
+        These calls don't go through self.client: a sync client can't be
+        awaited, and an async client's connection pool is bound to the event
+        loop it was opened on. Each run opens its own AsyncAnthropic, with
+        the shared client's credentials and endpoint.
+        """
+        from anthropic import AsyncAnthropic
+
+        semaphore = asyncio.Semaphore(self.config.max_concurrent_claude_calls)
+        async with AsyncAnthropic(
+            api_key=getattr(self.client, "api_key", None) or self.config.anthropic_api_key,
+            base_url=getattr(self.client, "base_url", None),
+            timeout=300.0,
+            max_retries=self.config.max_retry_attempts,
+        ) as client:
+            # The first request writes the system prompt to the prompt cache.
+            # The rest start once its response begins streaming, when the
+            # cache entry is readable, instead of each writing it themselves.
+            first_started = asyncio.Event()
+            first = asyncio.ensure_future(
+                self._extract_group_async(client, semaphore, groups[0], first_started)
+            )
+            await first_started.wait()
+            return await asyncio.gather(
+                first,
+                *(
+                    self._extract_group_async(client, semaphore, group)
+                    for group in groups[1:]
+                ),
+                return_exceptions=True,
+            )
+
+    async def _extract_group_async(
+        self,
+        client: "AsyncAnthropic",
+        semaphore: asyncio.Semaphore,
+        group: List[Dict[str, Any]],
+        started: Optional[asyncio.Event] = None,
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Extract stories from one request's newsletters.
+
+        Args:
+            client: Async Claude client
+            semaphore: Limits concurrent requests
+            group: Newsletters sent together in one request
+            started: Optional event set once the response starts streaming
+                (or the request fails before it does)
+
+        Returns:
+            List of stories for each newsletter in the group
+        """
         try:
-            response = self.client.messages.create(
-                model=self.config.claude_model,
-                max_tokens=self.config.claude_max_tokens,
-                temperature=self.config.claude_temperature,
-                system=system_prompt,
-                messages=[{"role": "user", "content": user_prompt}],
+            # Stream so the response drains while other requests run
+            async with semaphore, client.messages.stream(
+                **self._message_params(group)
+            ) as stream:
+                if started is not None:
+                    # message_start arrives after the prompt has been processed
+                    await anext(stream, None)
+                    started.set()
+                response = await stream.get_final_message()
+
+            return self._stories_from_response(group, response)
+
+        except _UnroutableGroupResponse as e:
+            print(
+                f"  [RETRY] {self._subject_preview(group[0])} (+{len(group) - 1} more): "
+                f"{e}, extracting newsletters individually"
+            )
+            results = await asyncio.gather(
+                *(self._extract_group_async(client, semaphore, [n]) for n in group)
             )
+            return [stories for (stories,) in results]
+        except json.JSONDecodeError as e:
+            for newsletter in group:
+                print(f"  [ERROR] {self._subject_preview(newsletter)}: Failed to parse JSON: {e}")
+            return [[] for _ in group]
+        except Exception as e:
+            for newsletter in group:
+                print(
+                    f"  [ERROR] {self._subject_preview(newsletter)}: "
+                    f"Failed to extract stories: {e}"
+                )
+            return [[] for _ in group]
+        finally:
+            if started is not None:
+                started.set()
+
+    def _extract_all_batch(
+        self, groups: List[List[Dict[str, Any]]]
+    ) -> Optional[List[List[List[Dict[str, Any]]]]]:
+        """
+        Extract stories from all newsletter groups with one Message Batch.
 
-            response_text = response.content[0].text
-            stories = self._parse_response(response_text)
+        Args:
+            groups: Newsletter groups, one batch request each
 
-            # Add source metadata to each story
+        Returns:
+            Stories per newsletter for each group in input order, or None if
+            the batch could not be completed (the caller then falls back to
+            direct calls)
+        """
+        results = [[[] for _ in group] for group in groups]
+        # Groups whose batch result is unusable; re-extracted with direct calls
+        retry_groups = []
+        requests = [
+            {"custom_id": f"group-{g}", "params": self._message_params(group)}
+            for g, group in enumerate(groups)
+        ]
+
+        print(f"\nSubmitting {len(requests)} requests to the Message Batches API...")
+        try:
+            batch = self.client.messages.batches.create(requests=requests)
+            deadline = time.monotonic() + self.config.claude_batch_timeout
+            while batch.processing_status != "ended":
+                if time.monotonic() > deadline:
+                    self.client.messages.batches.cancel(batch.id)
+                    print("[WARNING] Message batch timed out, falling back to direct calls")
+                    return None
+                time.sleep(BATCH_POLL_INTERVAL_SECONDS)
+                batch = self.client.messages.batches.retrieve(batch.id)
+
+            for entry in self.client.messages.batches.results(batch.id):
+                g = int(entry.custom_id.rsplit("-", 1)[1])
+                group = groups[g]
+                if entry.result.type != "succeeded":
+                    for newsletter in group:
+                        print(
+                            f"  [RETRY] {self._subject_preview(newsletter)}: "
+                            f"Batch request {entry.result.type}, extracting directly"
+                        )
+                    retry_groups.append(g)
+                    continue
+                try:
+                    results[g] = self._stories_from_response(group, entry.result.message)
+                except _UnroutableGroupResponse as e:
+                    print(
+                        f"  [RETRY] {self._subject_preview(group[0])} (+{len(group) - 1} more): "
+                        f"{e}, extracting newsletters individually"
+                    )
+                    retry_groups.append(g)
+                except json.JSONDecodeError as e:
+                    for newsletter in group:
+                        print(
+                            f"  [ERROR] {self._subject_preview(newsletter)}: "
+                            f"Failed to parse JSON: {e}"
+                        )
+
+        except Exception as e:
+            print(f"[WARNING] Message batch failed, falling back to direct calls: {e}")
+            return None
+
+        if retry_groups:
+            singles = [[newsletter] for g in retry_groups for newsletter in groups[g]]
+            single_results = iter(asyncio.run(self._extract_all_async(singles)))
+            for g in retry_groups:
+                results[g] = [
+                    [] if isinstance(result, BaseException) else result[0]
+                    for result in itertools.islice(single_results, len(groups[g]))
+                ]
+
+        return results
+
+    def _message_params(self, group: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Build the Messages API parameters for extracting a newsletter group."""
+        if len(group) == 1:
+            newsletter = group[0]
+            user_prompt = self._build_user_prompt(
+                self.config.get_source_name(newsletter["from"]),
+                self._parse_date(newsletter.get("date", "")),
+                newsletter["subject"],
+                newsletter["text"],
+            )
+        else:
+            user_prompt = self._build_multi_user_prompt(group)
+
+        return {
+            "model": self.config.claude_model,
+            "max_tokens": self.config.claude_max_tokens,
+            "temperature": self.config.claude_temperature,
+            # The system prompt is identical for every request, so it is
+            # cached after the first call and read back by the rest
+            "system": [
+                {
+                    "type": "text",
+                    "text": self._build_system_prompt(),
+                    "cache_control": {"type": "ephemeral"},
+                }
+            ],
+            "messages": [{"role": "user", "content": user_prompt}],
+        }
+
+    def _stories_from_response(
+        self, group: List[Dict[str, Any]], response: Any
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Parse a Claude message into stories per newsletter, fill in metadata
+        and cache them.
+
+        Args:
+            group: Newsletters that were sent in the request
+            response: Claude message
+
+        Returns:
+            List of stories for each newsletter in the group
+        """
+        usage = response.usage
+        cache_read = getattr(usage, "cache_read_input_tokens", 0) or 0
+        cache_write = getattr(usage, "cache_creation_input_tokens", 0) or 0
+        label = self._subject_preview(group[0])
+        if len(group) > 1:
+            label += f" (+{len(group) - 1} more)"
+        print(f"  {label}: prompt cache {cache_read} tokens read, {cache_write} tokens written")
+
+        if len(group) == 1:
+            stories = self._parse_response(response.content[0].text)
             for story in stories:
+                story.pop("newsletter_id", None)
+            per_newsletter = [stories]
+        else:
+            per_newsletter = self._route_group_stories(group, response)
+
+        for newsletter, newsletter_stories in zip(group, per_newsletter):
+            # Add source metadata to each story
+            source_name = self.config.get_source_name(newsletter["from"])
+            newsletter_date = self._parse_date(newsletter.get("date", ""))
+            for story in newsletter_stories:
                 if "source" not in story or not story["source"]:
                     story["source"] = source_name
                 if "date" not in story or not story["date"]:
                     story["date"] = newsletter_date
 
-            return stories
+            if self._cache is not None:
+                self._cache.set(
+                    newsletter.get("cache_key") or self._cache_key(newsletter),
+                    newsletter_stories,
+                    expire=EXTRACTION_CACHE_TTL_SECONDS,
+                )
+
+        return per_newsletter
+
+    def _route_group_stories(
+        self, group: List[Dict[str, Any]], response: Any
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Split a multi-newsletter response into stories per newsletter.
+
+        Raises:
+            _UnroutableGroupResponse: If the response was cut off at
+                max_tokens, isn't valid JSON, or has a story without a valid
+                newsletter_id. Guessing would misattribute (and cache)
+                stories, so the caller re-extracts each newsletter alone.
+        """
+        if getattr(response, "stop_reason", None) == "max_tokens":
+            raise _UnroutableGroupResponse("response hit max_tokens")
 
+        try:
+            stories = self._parse_response(response.content[0].text)
         except json.JSONDecodeError as e:
-            print(f"  [ERROR] Failed to parse JSON: {e}")
-            return []
+            raise _UnroutableGroupResponse(f"unparseable response ({e})") from e
+
+        per_newsletter: List[List[Dict[str, Any]]] = [[] for _ in group]
+        for story in stories:
+            try:
+                index = int(story.pop("newsletter_id")) - 1
+            except (KeyError, TypeError, ValueError):
+                index = -1
+            if not 0 <= index < len(group):
+                raise _UnroutableGroupResponse("story without a valid newsletter_id")
+            per_newsletter[index].append(story)
+
+        return per_newsletter
+
+    def _get_cached(
+        self, newsletter: Dict[str, Any], key: str
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Return previously extracted stories for this newsletter, if cached."""
+        if self._cache is None:
+            return None
+        cached = self._cache.get(key)
+        if cached is not None:
+            print(f"  {self._subject_preview(newsletter)}: using cached extraction")
+        return cached
+
+    @staticmethod
+    def _looks_newsless(text: str) -> bool:
+        """Check if text has no news verbs but reads like a tips/tutorial edition."""
+        if _NEWS_SIGNAL_RE.search(text):
+            return False
+        return len(_TUTORIAL_MARKER_RE.findall(text)) >= MIN_TUTORIAL_MARKERS
+
+    def _fit_to_token_budget(self, text: str) -> str:
+        """
+        Truncate newsletter text to the per-call input token budget.
+
+        Every token covers at least one byte, so text whose UTF-8 size is
+        within the budget always fits and is returned unchanged without a
+        token count. Longer text is counted with the token counting endpoint
+        and cut proportionally until it fits.
+
+        Args:
+            text: Newsletter text
+
+        Returns:
+            The original text object if it fits, otherwise a truncated copy
+        """
+        budget = self._text_token_budget
+        if len(text.encode("utf-8")) <= budget:
+            return text
+
+        candidate = text
+        try:
+            for _ in range(MAX_TRUNCATION_ROUNDS):
+                tokens = self._count_tokens([{"role": "user", "content": candidate}])
+                if tokens <= budget:
+                    break
+                # Aim slightly under the budget so one more round usually fits
+                candidate = candidate[: int(len(candidate) * budget / tokens * 0.95)]
         except Exception as e:
-            print(f"  [ERROR] Failed to extract stories: {e}")
-            return []
+            print(f"  [WARNING] Token counting failed, truncating by size: {e}")
+            candidate = text.encode("utf-8")[:budget].decode("utf-8", errors="ignore")
+
+        if candidate is text:
+            return text
+        return candidate + TRUNCATION_MARKER
+
+    @cached_property
+    def _text_token_budget(self) -> int:
+        """Tokens left for newsletter text after the prompts and the response."""
+        try:
+            system_tokens = self._count_tokens(
+                [{"role": "user", "content": "."}],
+                system=self._build_system_prompt(),
+            )
+        except Exception as e:
+            print(f"  [WARNING] Could not count system prompt tokens: {e}")
+            system_tokens = len(self._build_system_prompt().encode("utf-8"))
+
+        return (
+            self.config.claude_context_budget
+            - system_tokens
+            - self.config.claude_max_tokens
+            - PROMPT_OVERHEAD_TOKENS
+        )
+
+    def _count_tokens(self, messages: List[Dict[str, Any]], **kwargs: Any) -> int:
+        """Count input tokens for a request with the token counting endpoint."""
+        return self.client.messages.count_tokens(
+            model=self.config.claude_model,
+            messages=messages,
+            **kwargs,
+        ).input_tokens
+
+    @staticmethod
+    def _subject_preview(newsletter: Dict[str, Any]) -> str:
+        """Shorten the subject and make it safe for the Windows console."""
+        return newsletter["subject"][:50].encode("ascii", "replace").decode("ascii")
+
+    @cached_property
+    def _system_prompt_hash(self) -> str:
+        """Hash of the system prompt, so prompt edits invalidate cached extractions."""
+        return hashlib.sha256(self._build_system_prompt().encode("utf-8")).hexdigest()
+
+    def _cache_key(self, newsletter: Dict[str, Any]) -> str:
+        """Hash the newsletter content and extraction settings into a cache key."""
+        digest = hashlib.sha256()
+        for value in (
+            str(EXTRACTION_CACHE_VERSION),
+            self.config.claude_model,
+            self._system_prompt_hash,
+            # Budgets decide how much of a long newsletter was sent
+            str(self.config.claude_context_budget),
+            str(self.config.claude_max_tokens),
+            newsletter.get("from", ""),
+            newsletter.get("date", ""),
+            newsletter.get("subject", ""),
+            newsletter.get("text", ""),
+        ):
+            digest.update(value.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
 
     def _build_system_prompt(self) -> str:
         """Build the system prompt for story extraction."""
@@ -127,17 +664,60 @@ Output ONLY valid JSON in this exact format:
   ]
 }
 
-Extract everything that qualifies as news. Do NOT deduplicate - that happens in a later step."""
+Extract everything that qualifies as news. Do NOT deduplicate - that happens in a later step.
+
+EXTRACTION RUBRIC
+
+What counts as a news story:
+- Something happened (or was officially announced) recently, and it can be stated as a fact about a specific company, organization, person, product or research result.
+- Product news: a new model, app, API, feature, pricing change, availability expansion (new countries, new platforms), or deprecation/shutdown.
+- Business news: funding rounds, valuations, acquisitions, mergers, IPO filings, revenue or user milestones, layoffs, executive hires and departures, partnerships and licensing deals.
+- Research news: a published paper, benchmark result, open-source release or technical report, when the newsletter presents it as a development rather than as a tutorial.
+- Policy and legal news: regulation, government action, lawsuits, court rulings, settlements, safety incidents and official investigations.
+- A newsletter item that bundles several distinct announcements (e.g. a "quick hits" or "in other news" list) contains several stories; extract each one separately.
+
+What is NOT a news story (skip it entirely):
+- Tool roundups, "trending tools" lists, app-of-the-day recommendations and product directories.
+- Prompts, prompt templates, workflows, tips, tricks, cheat sheets, tutorials and how-to guides.
+- Opinion, analysis or commentary that does not report a new event (the author's take on an older story, predictions, essays).
+- Sponsored content, advertisements, job listings, event promotions, surveys, referral programs and newsletter housekeeping.
+- Memes, polls, quizzes, reader questions and community highlights.
+If an item mixes news with commentary, extract the news and ignore the commentary.
+
+Field guidance:
+- headline: One line, at most about 15 words. Name the main actor and what happened ("OpenAI releases GPT-5 to all ChatGPT users"), not a teaser ("You won't believe what OpenAI just did"). Do not add emojis or newsletter section labels.
+- source: The newsletter name given in the user message, exactly as written.
+- date: The newsletter date given in the user message unless the story clearly states a different announcement date.
+- summary: Plain factual sentences covering who, what, and the key numbers (amounts, valuations, model sizes, dates). Do not speculate and do not copy marketing language.
+- url: The link the newsletter attaches to that story. Prefer the link to the original announcement or article over tracking, sharing or unsubscribe links. Use null rather than guessing.
+- is_launch: true only when something new became available or was created (a model, product, feature, company or open-source release). Funding, partnerships, lawsuits, research findings and personnel moves are not launches.
+
+Handling common newsletter layouts:
+- Lead stories: usually a headline followed by several paragraphs ("The Rundown", "Why it matters", "The details"). Extract one story and summarize the factual paragraphs; use the "why it matters" text only if it adds facts.
+- Bullet lists of short items: each bullet that reports a distinct event is its own story, even if it is only one sentence long.
+- Links with short blurbs: treat the blurb as the summary and the link as the url.
+- Repeated mentions: if the same event appears in the intro and again in the body, extract it once, using the fuller description.
+- Plain-text versions of HTML emails often show links as bracketed or footnoted URLs; match each story to the nearest link that belongs to it.
+- Ignore the header, table of contents, footer, unsubscribe text, mailing address and social links.
+
+Examples:
+- "Anthropic raised $4B at a $60B valuation" -> news, is_launch false.
+- "Google rolled out Gemini in Gmail for all Workspace users" -> news, is_launch true.
+- "5 prompts to write better emails with ChatGPT" -> not news, skip.
+- "Why I think AGI is further away than people say" -> not news, skip.
+- "Try Acme AI, the fastest way to build agents (sponsored)" -> not news, skip.
+
+Several newsletters in one message:
+- The user message may contain several newsletters, each wrapped in a <newsletter id="..." source="..." date="..." subject="..."> tag. Extract stories from every one of them.
+- Add a "newsletter_id" field to each story with the id of the newsletter it came from, and take source and date from that newsletter's tag.
+- Keep stories from different newsletters separate, even when they report the same event.
+
+If the newsletter contains no qualifying news, return {"stories": []}."""
 
     def _build_user_prompt(
         self, source_name: str, date: str, subject: str, text: str
     ) -> str:
         """Build the user prompt with newsletter content."""
-        # Truncate very long newsletters to avoid token limits
-        max_chars = 50000
-        if len(text) > max_chars:
-            text = text[:max_chars] + "\n\n[Content truncated...]"
-
         return f"""Extract all news stories from this newsletter:
 
 Newsletter: {source_name}
@@ -149,21 +729,40 @@ Content:
 
 Extract all news stories and return them as JSON."""
 
+    def _build_multi_user_prompt(self, group: List[Dict[str, Any]]) -> str:
+        """Build a user prompt with several newsletters as tagged documents."""
+        documents = []
+        for i, newsletter in enumerate(group, 1):
+            source_name = html.escape(self.config.get_source_name(newsletter["from"]))
+            newsletter_date = self._parse_date(newsletter.get("date", ""))
+            subject = html.escape(newsletter["subject"])
+            documents.append(
+                f'<newsletter id="{i}" source="{source_name}" date="{newsletter_date}" '
+                f'subject="{subject}">\n{newsletter["text"]}\n</newsletter>'
+            )
+        newsletters_xml = "\n\n".join(documents)
+
+        return f"""Extract all news stories from each of these {len(group)} newsletters:
+
+{newsletters_xml}
+
+Extract all news stories, set newsletter_id on each one, and return them as JSON."""
+
     def _parse_response(self, response_text: str) -> List[Dict[str, Any]]:
         """Parse Claude's response and extract stories."""
         # Try to extract JSON from markdown code block
-        json_match = re.search(r"```json\s*(.*?)\s*```", response_text, re.DOTALL)
+        json_match = _JSON_BLOCK_RE.search(response_text)
         if json_match:
             json_text = json_match.group(1)
         else:
             # Try to find raw JSON
-            json_match = re.search(r"\{.*\}", response_text, re.DOTALL)
+            json_match = _RAW_JSON_RE.search(response_text)
             if json_match:
                 json_text = json_match.group(0)
             else:
                 json_text = response_text
 
-        result = json.loads(json_text)
+        result = _json_loads(json_text)
         return result.get("stories", [])
 
     def _parse_date(self, date_str: str) -> str:
@@ -172,10 +771,9 @@ Extract all news stories and return them as JSON."""
             return datetime.now().strftime("%Y-%m-%d")
 
         try:
-            # Common email date format: "Mon, 27 Jan 2025 08:00:00 +0000"
-            parsed = datetime.strptime(date_str[:16], "%a, %d %b %Y")
-            return parsed.strftime("%Y-%m-%d")
-        except ValueError:
+            # RFC 2822 email dates, e.g. "Mon, 27 Jan 2025 08:00:00 +0000"
+            return parsedate_to_datetime(date_str).strftime("%Y-%m-%d")
+        except (TypeError, ValueError):
             pass
 
         try:
@@ -0,0 +1,202 @@
+"""Tests for local duplicate merging in the deduplicator."""
+
+import pytest
+
+from src import deduplicator as deduplicator_module
+from src.deduplicator import Deduplicator, _canonical_url
+
+
+@pytest.fixture
+def deduplicator():
+    """Deduplicator with a placeholder client (no API calls are made)."""
+    return Deduplicator(client=object())
+
+
+class TestCanonicalUrl:
+    def test_strips_scheme_www_and_trailing_slash(self):
+        assert _canonical_url("https://www.OpenAI.com/Blog/GPT-5/") == "openai.com/blog/gpt-5"
+
+    def test_strips_tracking_params(self):
+        url = "https://openai.com/blog/x?utm_source=tldr&fbclid=abc&ref=newsletter"
+        assert _canonical_url(url) == "openai.com/blog/x"
+
+    def test_keeps_content_params_sorted(self):
+        assert _canonical_url("https://openai.com/blog/x?b=2&a=1") == "openai.com/blog/x?a=1&b=2"
+
+    def test_query_identified_content_stays_distinct(self):
+        first = _canonical_url("https://www.youtube.com/watch?v=aaa&utm_medium=email")
+        second = _canonical_url("https://www.youtube.com/watch?v=bbb")
+        assert first == "youtube.com/watch?v=aaa"
+        assert first != second
+
+    @pytest.mark.parametrize("url", [
+        None,
+        "",
+        "https://openai.com",
+        "https://openai.com/?utm_source=tldr",
+        "not a url",
+    ])
+    def test_unusable_urls(self, url):
+        assert _canonical_url(url) is None
+
+
+class TestPrecluster:
+    def test_merges_identical_headlines(self, deduplicator):
+        stories = [
+            {"headline": "OpenAI launches GPT-5", "summary": "A", "source": "TLDR AI"},
+            {"headline": "OpenAI Launches GPT-5!", "summary": "B", "source": "The Rundown"},
+        ]
+
+        clustered = deduplicator._precluster(stories)
+
+        assert len(clustered) == 1
+        assert clustered[0]["source"] == "TLDR AI"
+        assert clustered[0]["duplicates"] == [{
+            "headline": "OpenAI Launches GPT-5!",
+            "summary": "B",
+            "source": "The Rundown",
+            "url": None,
+        }]
+
+    def test_merges_shared_canonical_url(self, deduplicator):
+        stories = [
+            {"headline": "GPT-5 is here", "source": "TLDR AI",
+             "url": "https://openai.com/gpt-5?utm_source=a"},
+            {"headline": "OpenAI ships its next model", "source": "The Rundown",
+             "url": "https://www.openai.com/gpt-5/"},
+        ]
+
+        assert len(deduplicator._precluster(stories)) == 1
+
+    def test_ignores_url_shared_within_one_source(self, deduplicator):
+        issue_page = "https://tldr.tech/ai/2025-01-06"
+        stories = [
+            {"headline": "GPT-5 launches", "source": "TLDR AI", "url": issue_page},
+            {"headline": "Gemini comes to Gmail", "source": "TLDR AI", "url": issue_page},
+            {"headline": "Claude gets memory", "source": "The Rundown", "url": issue_page},
+        ]
+
+        clustered = deduplicator._precluster(stories)
+
+        assert len(clustered) == 3
+        assert not any("duplicates" in s for s in clustered)
+
+    def test_keeps_similar_headlines_apart(self, deduplicator):
+        stories = [
+            {"headline": "OpenAI launches GPT-4"},
+            {"headline": "OpenAI launches GPT-5"},
+            {"headline": "Gemini comes to Gmail"},
+            {"headline": "Gemini comes to Search"},
+        ]
+
+        clustered = deduplicator._precluster(stories)
+
+        assert [s["headline"] for s in clustered] == [s["headline"] for s in stories]
+        assert not any("duplicates" in s for s in clustered)
+
+    def test_merges_transitively_in_original_order(self, deduplicator):
+        stories = [
+            {"headline": "A", "source": "TLDR AI", "url": "https://a.com/1"},
+            {"headline": "Unrelated", "source": "TLDR AI"},
+            {"headline": "B", "source": "The Rundown", "url": "https://a.com/1"},
+            {"headline": "b", "source": "Ben's Bites"},
+        ]
+
+        clustered = deduplicator._precluster(stories)
+
+        assert [s["headline"] for s in clustered] == ["A", "Unrelated"]
+        assert [d["headline"] for d in clustered[0]["duplicates"]] == ["B", "b"]
+
+
+class FakeEmbeddingModel:
+    """Embeds each text as a fixed vector looked up by its headline."""
+
+    def __init__(self, vectors):
+        self.vectors = vectors
+
+    def embed(self, texts, batch_size):
+        return [self.vectors[text.split(".")[0]] for text in texts]
+
+
+@pytest.fixture
+def embeddings(monkeypatch):
+    """Enable embedding grouping with a fake model; returns the vector table."""
+    np = pytest.importorskip("numpy")
+    vectors = {}
+    monkeypatch.setattr(deduplicator_module, "np", np, raising=False)
+    monkeypatch.setattr(deduplicator_module, "EMBEDDINGS_AVAILABLE", True)
+    monkeypatch.setattr(
+        deduplicator_module, "_get_embedding_model", lambda: FakeEmbeddingModel(vectors)
+    )
+    return vectors
+
+
+class TestGroupPossibleDuplicates:
+    def test_groups_similar_stories_with_summaries(self, deduplicator, embeddings):
+        embeddings.update({
+            "GPT-5 launches": [1.0, 0.0],
+            "OpenAI ships GPT-5": [0.99, 0.05],
+            "Gemini in Gmail": [0.0, 1.0],
+        })
+        stories = [
+            {"headline": "GPT-5 launches", "summary": "A", "source": "TLDR AI"},
+            {"headline": "Gemini in Gmail", "summary": "B", "source": "TLDR AI"},
+            {"headline": "OpenAI ships GPT-5", "summary": "C", "source": "The Rundown"},
+        ]
+
+        grouped = deduplicator._group_possible_duplicates(stories)
+
+        assert [s["headline"] for s in grouped] == ["GPT-5 launches", "Gemini in Gmail"]
+        assert grouped[0]["possible_duplicates"] == [stories[2]]
+        assert "possible_duplicates" not in grouped[1]
+
+    def test_keeps_stories_below_threshold_apart(self, deduplicator, embeddings):
+        embeddings.update({"GPT-4 update": [1.0, 0.0], "GPT-5 launches": [0.8, 0.6]})
+        stories = [
+            {"headline": "GPT-4 update", "source": "TLDR AI"},
+            {"headline": "GPT-5 launches", "source": "The Rundown"},
+        ]
+
+        assert deduplicator._group_possible_duplicates(stories) == stories
+
+    def test_never_groups_within_one_source(self, deduplicator, embeddings):
+        embeddings.update({"A": [1.0, 0.0], "B": [1.0, 0.0]})
+        stories = [{"headline": "A", "source": "TLDR AI"}, {"headline": "B", "source": "TLDR AI"}]
+
+        assert deduplicator._group_possible_duplicates(stories) == stories
+
+    def test_skipped_without_fastembed(self, deduplicator, monkeypatch):
+        monkeypatch.setattr(deduplicator_module, "EMBEDDINGS_AVAILABLE", False)
+        stories = [{"headline": "A"}, {"headline": "A too"}]
+
+        assert deduplicator._group_possible_duplicates(stories) is stories
+
+
+class TestReinflateSources:
+    def test_restores_dropped_sources(self, deduplicator):
+        stories = deduplicator._precluster([
+            {"headline": "GPT-5", "source": "TLDR AI", "url": "https://openai.com/gpt-5"},
+            {"headline": "GPT-5", "source": "The Rundown", "url": "https://openai.com/gpt-5"},
+        ])
+        result = {
+            "top_stories": [{
+                "sources": ["TLDR AI"],
+                "urls": ["https://openai.com/gpt-5?utm_source=x"],
+                "mention_count": 1,
+            }],
+            "secondary_stories": [],
+        }
+
+        deduplicator._reinflate_sources(result, stories)
+
+        story = result["top_stories"][0]
+        assert story["sources"] == ["TLDR AI", "The Rundown"]
+        assert story["mention_count"] == 2
+
+    def test_leaves_unmerged_stories_untouched(self, deduplicator):
+        stories = [{"headline": "Solo", "source": "TLDR AI", "url": "https://a.com/x"}]
+        result = {"top_stories": [{"sources": ["TLDR AI"], "urls": ["https://a.com/x"]}]}
+
+        deduplicator._reinflate_sources(result, stories)
+
+        assert result["top_stories"][0] == {"sources": ["TLDR AI"], "urls": ["https://a.com/x"]}
@@ -0,0 +1,276 @@
+"""Tests for Gmail payload parsing and per-request retries."""
+
+import base64
+
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+
+from src.gmail_client import HTML_PARSING_AVAILABLE, MAX_REQUEST_ATTEMPTS, GmailClient
+
+
+@pytest.fixture
+def client():
+    """GmailClient without authentication (payload parsing only)."""
+    return GmailClient.__new__(GmailClient)
+
+
+def part(mime_type, text=None):
+    body = {"data": base64.urlsafe_b64encode(text.encode("utf-8")).decode("ascii")} if text else {}
+    return {"mimeType": mime_type, "body": body}
+
+
+def multipart(mime_type, *parts):
+    return {"mimeType": mime_type, "parts": list(parts)}
+
+
+requires_html_parser = pytest.mark.skipif(
+    not HTML_PARSING_AVAILABLE, reason="no HTML parser installed"
+)
+
+
+class TestExtractTextFromPayload:
+    def test_single_plain_part(self, client):
+        assert client._extract_text_from_payload(part("text/plain", "hello")) == "hello"
+
+    def test_alternative_prefers_plain_text(self, client):
+        payload = multipart(
+            "multipart/alternative",
+            part("text/html", "<p>html</p>"),
+            part("text/plain", "plain"),
+        )
+
+        assert client._extract_text_from_payload(payload) == "plain"
+
+    def test_nested_parts_in_document_order(self, client):
+        payload = multipart(
+            "multipart/mixed",
+            multipart(
+                "multipart/alternative",
+                part("text/html", "<p>H1</p>"),
+                part("text/plain", "P1"),
+            ),
+            part("text/plain", "P2"),
+        )
+
+        assert client._extract_text_from_payload(payload) == "P1\n\nP2"
+
+    def test_empty_payload(self, client):
+        assert client._extract_text_from_payload(multipart("multipart/mixed")) == ""
+
+    def test_unicode_plain_text(self, client):
+        assert client._extract_text_from_payload(part("text/plain", "café — 🤖")) == "café — 🤖"
+
+    @requires_html_parser
+    def test_falls_back_to_html(self, client):
+        payload = part(
+            "text/html",
+            "<html><head><style>p {}</style></head><body>Only html</body></html>",
+        )
+
+        assert client._extract_text_from_payload(payload) == "Only html"
+
+    @requires_html_parser
+    def test_empty_plain_part_falls_back_to_nested_html(self, client):
+        payload = multipart(
+            "multipart/alternative",
+            part("text/plain"),
+            multipart("multipart/related", part("text/html", "<div>Rel <b>html</b></div>")),
+        )
+
+        assert client._extract_text_from_payload(payload) == "Rel\nhtml"
+
+    @requires_html_parser
+    def test_joins_multiple_html_parts(self, client):
+        payload = multipart(
+            "multipart/alternative",
+            part("text/html", "<p>a</p>"),
+            part("text/html", "<p>b</p>"),
+        )
+
+        assert client._extract_text_from_payload(payload) == "a\n\nb"
+
+
+def http_error(status, retry_after=None):
+    headers = {"status": str(status)}
+    if retry_after is not None:
+        headers["retry-after"] = str(retry_after)
+    return HttpError(httplib2.Response(headers), b"")
+
+
+class FakeRequest:
+    """Request whose execute() raises or returns each scripted outcome in turn."""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def execute(self, http=None):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record retry delays instead of sleeping."""
+    delays = []
+    monkeypatch.setattr("src.gmail_client.time.sleep", delays.append)
+    return delays
+
+
+class TestExecuteWithRetry:
+    @pytest.mark.parametrize("error", [
+        http_error(429),
+        http_error(500),
+        http_error(502),
+        http_error(503),
+        http_error(504),
+        ConnectionResetError("reset"),
+        TimeoutError("timed out"),
+        httplib2.HttpLib2Error("transport"),
+    ])
+    def test_retries_transient_errors(self, client, sleeps, error):
+        request = FakeRequest(error, {"id": "1"})
+
+        assert client._execute_with_retry(request) == {"id": "1"}
+        assert request.calls == 2
+        assert len(sleeps) == 1
+
+    def test_honors_retry_after(self, client, sleeps):
+        client._execute_with_retry(FakeRequest(http_error(429, retry_after=7), {}))
+
+        assert sleeps == [7.0]
+
+    @pytest.mark.parametrize("error", [http_error(400), http_error(404), ValueError("bad")])
+    def test_permanent_errors_raise_immediately(self, client, sleeps, error):
+        request = FakeRequest(error, {})
+
+        with pytest.raises(type(error)):
+            client._execute_with_retry(request)
+        assert request.calls == 1
+        assert not sleeps
+
+    def test_gives_up_after_max_attempts(self, client, sleeps):
+        request = FakeRequest(*[http_error(503)] * MAX_REQUEST_ATTEMPTS)
+
+        with pytest.raises(HttpError):
+            client._execute_with_retry(request)
+        assert request.calls == MAX_REQUEST_ATTEMPTS
+        assert len(sleeps) == MAX_REQUEST_ATTEMPTS - 1
+
+    @pytest.mark.parametrize("error", [http_error(429), http_error(503)])
+    def test_send_retries_rejected_requests(self, client, sleeps, error):
+        request = FakeRequest(error, {"id": "sent"})
+
+        assert client._execute_with_retry(request, idempotent=False) == {"id": "sent"}
+
+    @pytest.mark.parametrize("error", [
+        http_error(500),
+        http_error(502),
+        http_error(504),
+        ConnectionResetError("reset"),
+        TimeoutError("timed out"),
+    ])
+    def test_send_does_not_retry_possibly_delivered_requests(self, client, sleeps, error):
+        request = FakeRequest(error, {"id": "sent"})
+
+        with pytest.raises(type(error)):
+            client._execute_with_retry(request, idempotent=False)
+        assert request.calls == 1
+
+
+class FakeBatch:
+    """Batch request that answers each added message from a shared script."""
+
+    def __init__(self, service, callback):
+        self.service = service
+        self.callback = callback
+        self.request_ids = []
+
+    def add(self, request, request_id):
+        self.request_ids.append(request_id)
+
+    def execute(self, http=None):
+        self.service.batches.append(list(self.request_ids))
+        if self.service.batch_error:
+            raise self.service.batch_error
+        for request_id in self.request_ids:
+            outcome = self.service.outcomes[request_id].pop(0)
+            if isinstance(outcome, BaseException):
+                self.callback(request_id, None, outcome)
+            else:
+                self.callback(request_id, outcome, None)
+
+
+class FakeService:
+    """Gmail service whose messages.get results are scripted per message ID."""
+
+    def __init__(self, outcomes, batch_error=None):
+        self.outcomes = outcomes
+        self.batch_error = batch_error
+        self.batches = []
+
+    def new_batch_http_request(self, callback):
+        return FakeBatch(self, callback)
+
+    def users(self):
+        return self
+
+    def messages(self):
+        return self
+
+    def get(self, userId, id, **kwargs):
+        return id
+
+
+class TestBatchGetMessages:
+    def test_rebatches_only_rate_limited_messages(self, client, sleeps):
+        client.service = FakeService({
+            "a": [{"id": "a"}],
+            "b": [http_error(429), http_error(429), {"id": "b"}],
+            "c": [http_error(404)],
+            "d": [http_error(503), {"id": "d"}],
+        })
+
+        responses = client._batch_get_messages(["a", "b", "c", "d"], batch_size=10)
+
+        assert responses == {"a": {"id": "a"}, "b": {"id": "b"}, "d": {"id": "d"}}
+        assert client.service.batches == [["a", "b", "c", "d"], ["b", "d"], ["b"]]
+        assert len(sleeps) == 2
+
+    def test_respects_batch_size(self, client, sleeps):
+        client.service = FakeService({mid: [{"id": mid}] for mid in "abcde"})
+
+        responses = client._batch_get_messages(list("abcde"), batch_size=2)
+
+        assert list(responses) == list("abcde")
+        assert client.service.batches == [["a", "b"], ["c", "d"], ["e"]]
+
+    def test_gives_up_on_persistently_rate_limited_messages(self, client, sleeps):
+        client.service = FakeService({
+            "a": [{"id": "a"}],
+            "b": [http_error(429)] * MAX_REQUEST_ATTEMPTS,
+        })
+
+        responses = client._batch_get_messages(["a", "b"], batch_size=10)
+
+        assert responses == {"a": {"id": "a"}}
+        assert len(client.service.batches) == MAX_REQUEST_ATTEMPTS
+
+    def test_falls_back_to_individual_gets_when_batch_fails(self, client, sleeps, monkeypatch):
+        client.service = FakeService({}, batch_error=http_error(400))
+        fetched = []
+
+        def fake_get_concurrently(message_ids, **get_kwargs):
+            fetched.extend(message_ids)
+            return {mid: {"id": mid} for mid in message_ids}
+
+        monkeypatch.setattr(client, "_get_messages_concurrently", fake_get_concurrently)
+
+        responses = client._batch_get_messages(["a", "b"], batch_size=10, format="full")
+
+        assert fetched == ["a", "b"]
+        assert responses == {"a": {"id": "a"}, "b": {"id": "b"}}
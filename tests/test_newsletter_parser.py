@@ -0,0 +1,316 @@
+"""Tests for NewsletterParser helpers: packing, routing, budgeting, caching and dates."""
+
+import asyncio
+import json
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from src.newsletter_parser import (
+    MAX_NEWSLETTERS_PER_REQUEST,
+    NEWSLETTER_TAG_OVERHEAD_TOKENS,
+    TRUNCATION_MARKER,
+    NewsletterParser,
+    _UnroutableGroupResponse,
+)
+
+
+class FakeMessages:
+    """Stands in for client.messages, counting tokens as one per character."""
+
+    def __init__(self):
+        self.count_calls = 0
+
+    def count_tokens(self, model, messages, **kwargs):
+        self.count_calls += 1
+        return SimpleNamespace(input_tokens=len(messages[0]["content"]))
+
+
+class FakeCache(dict):
+    """Minimal diskcache.Cache stand-in."""
+
+    def set(self, key, value, expire=None):
+        self[key] = value
+
+
+@pytest.fixture
+def parser():
+    """Parser with a fake client, no disk cache and a 1000-token text budget."""
+    parser = NewsletterParser(client=SimpleNamespace(messages=FakeMessages()))
+    parser._cache = None
+    parser._text_token_budget = 1000
+    return parser
+
+
+def make_newsletter(n, text_len=200):
+    return {
+        "from": f"sender{n}@example.com",
+        "date": "Mon, 06 Jan 2025 08:00:00 +0000",
+        "subject": f"Issue {n}",
+        "text": "x" * text_len,
+    }
+
+
+def make_response(stories, stop_reason="end_turn"):
+    return SimpleNamespace(
+        stop_reason=stop_reason,
+        usage=SimpleNamespace(cache_read_input_tokens=0, cache_creation_input_tokens=0),
+        content=[SimpleNamespace(text=json.dumps({"stories": stories}))],
+    )
+
+
+class TestPackNewsletters:
+    def test_packs_up_to_budget(self, parser):
+        size = 400 - NEWSLETTER_TAG_OVERHEAD_TOKENS
+        newsletters = [make_newsletter(i, size) for i in range(5)]
+
+        groups = parser._pack_newsletters(newsletters)
+
+        assert [len(g) for g in groups] == [2, 2, 1]
+        assert [n for g in groups for n in g] == newsletters
+
+    def test_caps_newsletters_per_request(self, parser):
+        newsletters = [make_newsletter(i, 10) for i in range(MAX_NEWSLETTERS_PER_REQUEST + 1)]
+
+        groups = parser._pack_newsletters(newsletters)
+
+        assert [len(g) for g in groups] == [MAX_NEWSLETTERS_PER_REQUEST, 1]
+
+    def test_long_newsletter_goes_alone(self, parser):
+        newsletters = [make_newsletter(0, 100), make_newsletter(1, 5000), make_newsletter(2, 100)]
+
+        groups = parser._pack_newsletters(newsletters)
+
+        assert [len(g) for g in groups] == [1, 1, 1]
+
+
+class TestStoriesFromResponse:
+    def test_routes_stories_by_newsletter_id(self, parser):
+        group = [make_newsletter(0), make_newsletter(1)]
+        response = make_response([
+            {"headline": "B", "newsletter_id": 2},
+            {"headline": "A", "newsletter_id": "1", "source": "Custom"},
+        ])
+
+        per_newsletter = parser._stories_from_response(group, response)
+
+        assert [[s["headline"] for s in stories] for stories in per_newsletter] == [["A"], ["B"]]
+        assert per_newsletter[0][0]["source"] == "Custom"
+        assert per_newsletter[1][0]["date"] == "2025-01-06"
+        assert not any("newsletter_id" in s for stories in per_newsletter for s in stories)
+
+    @pytest.mark.parametrize("story", [
+        {"headline": "A"},
+        {"headline": "A", "newsletter_id": 3},
+        {"headline": "A", "newsletter_id": 0},
+        {"headline": "A", "newsletter_id": "first"},
+    ])
+    def test_unroutable_story_raises_without_caching(self, parser, story):
+        parser._cache = FakeCache()
+        group = [make_newsletter(0), make_newsletter(1)]
+
+        with pytest.raises(_UnroutableGroupResponse):
+            parser._stories_from_response(group, make_response([story]))
+        assert not parser._cache
+
+    def test_truncated_group_response_raises(self, parser):
+        group = [make_newsletter(0), make_newsletter(1)]
+        response = make_response([{"headline": "A", "newsletter_id": 1}], stop_reason="max_tokens")
+
+        with pytest.raises(_UnroutableGroupResponse):
+            parser._stories_from_response(group, response)
+
+    def test_single_newsletter_ignores_newsletter_id(self, parser):
+        parser._cache = FakeCache()
+        newsletter = {**make_newsletter(0), "cache_key": "key"}
+
+        per_newsletter = parser._stories_from_response(
+            [newsletter], make_response([{"headline": "A"}, {"headline": "B", "newsletter_id": 7}])
+        )
+
+        assert [s["headline"] for s in per_newsletter[0]] == ["A", "B"]
+        assert not any("newsletter_id" in s for s in per_newsletter[0])
+        assert parser._cache["key"] == per_newsletter[0]
+
+
+class TestFitToTokenBudget:
+    def test_short_text_skips_token_counting(self, parser):
+        text = "x" * 1000
+
+        assert parser._fit_to_token_budget(text) is text
+        assert parser.client.messages.count_calls == 0
+
+    def test_long_text_is_truncated_with_marker(self, parser):
+        fitted = parser._fit_to_token_budget("x" * 3000)
+
+        assert fitted.endswith(TRUNCATION_MARKER)
+        assert len(fitted) - len(TRUNCATION_MARKER) <= 1000
+        assert parser.client.messages.count_calls >= 1
+
+    def test_falls_back_to_byte_truncation(self, parser):
+        def fail(**kwargs):
+            raise RuntimeError("offline")
+
+        parser.client.messages.count_tokens = fail
+
+        fitted = parser._fit_to_token_budget("é" * 1000)
+
+        assert fitted == "é" * 500 + TRUNCATION_MARKER
+
+
+class FakeStream:
+    """Async message stream that records when it opens and yields three events."""
+
+    def __init__(self, log, name):
+        self.log = log
+        self.name = name
+        self.events = 3
+
+    async def __aenter__(self):
+        self.log.append(f"open {self.name}")
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.log.append(f"close {self.name}")
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        await asyncio.sleep(0)
+        if not self.events:
+            raise StopAsyncIteration
+        self.events -= 1
+        return "event"
+
+    async def get_final_message(self):
+        async for _ in self:
+            pass
+        return make_response([])
+
+
+class TestExtractAllAsync:
+    def test_rest_start_once_first_response_streams(self, parser, monkeypatch):
+        log = []
+
+        class FakeAsyncAnthropic:
+            def __init__(self, **kwargs):
+                self.messages = SimpleNamespace(stream=self.stream)
+
+            def stream(self, **params):
+                name = params["messages"][0]["content"].split("newsletter text ")[1][0]
+                return FakeStream(log, name)
+
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc_info):
+                pass
+
+        monkeypatch.setattr("anthropic.AsyncAnthropic", FakeAsyncAnthropic)
+        groups = [[{**make_newsletter(i), "text": f"newsletter text {i}"}] for i in range(3)]
+
+        results = asyncio.run(parser._extract_all_async(groups))
+
+        assert results == [[[]], [[]], [[]]]
+        assert log[0] == "open 0"
+        # The others open while the first is still streaming, not after it
+        assert log.index("open 1") < log.index("close 0")
+
+
+class TestExtractAllBatch:
+    def test_failed_entries_are_extracted_directly(self, parser, monkeypatch):
+        groups = [[make_newsletter(0)], [make_newsletter(1), make_newsletter(2)]]
+        entries = [
+            SimpleNamespace(
+                custom_id="group-0",
+                result=SimpleNamespace(
+                    type="succeeded", message=make_response([{"headline": "A"}])
+                ),
+            ),
+            SimpleNamespace(custom_id="group-1", result=SimpleNamespace(type="errored")),
+        ]
+        parser.client.messages.batches = SimpleNamespace(
+            create=lambda requests: SimpleNamespace(id="batch", processing_status="ended"),
+            results=lambda batch_id: entries,
+        )
+        retried = []
+
+        async def fake_extract_all_async(singles):
+            retried.extend(group[0]["subject"] for group in singles)
+            return [[[{"headline": group[0]["subject"]}]] for group in singles]
+
+        monkeypatch.setattr(parser, "_extract_all_async", fake_extract_all_async)
+
+        results = parser._extract_all_batch(groups)
+
+        assert retried == ["Issue 1", "Issue 2"]
+        assert [[[s["headline"] for s in stories] for stories in group] for group in results] == [
+            [["A"]],
+            [["Issue 1"], ["Issue 2"]],
+        ]
+
+
+class TestCacheKey:
+    def test_changes_with_token_budgets(self, parser, monkeypatch):
+        newsletter = make_newsletter(0)
+        key = parser._cache_key(newsletter)
+
+        monkeypatch.setattr(parser.config, "claude_context_budget", 64000, raising=False)
+        budget_key = parser._cache_key(newsletter)
+        monkeypatch.setattr(parser.config, "claude_max_tokens", 4000, raising=False)
+
+        assert len({key, budget_key, parser._cache_key(newsletter)}) == 3
+
+    def test_disk_cache_is_opt_in(self, parser):
+        assert parser.config.claude_cache_extractions is False
+        assert NewsletterParser(client=parser.client)._cache is None
+
+
+class TestParseDate:
+    @pytest.mark.parametrize("date_str, expected", [
+        ("Mon, 06 Jan 2025 08:00:00 +0000", "2025-01-06"),
+        ("Mon, 6 Jan 2025 08:00:00 +0000", "2025-01-06"),
+        ("6 Jan 2025 08:00:00 -0800", "2025-01-06"),
+        ("Wed, 1 Jan 2025 23:30:00 -0800 (PST)", "2025-01-01"),
+        ("Thu, 2 Jan 2025 07:15:00 +0000 (UTC)", "2025-01-02"),
+        ("2025-01-06T08:00:00Z", "2025-01-06"),
+        ("2025-01-06", "2025-01-06"),
+    ])
+    def test_parses_email_and_iso_dates(self, parser, date_str, expected):
+        assert parser._parse_date(date_str) == expected
+
+    @pytest.mark.parametrize("date_str", ["", "yesterday", "Mon, 99 Foo 2025"])
+    def test_falls_back_to_today(self, parser, date_str):
+        assert parser._parse_date(date_str) == datetime.now().strftime("%Y-%m-%d")
+
+
+class TestLooksNewsless:
+    def test_tutorial_edition_without_news(self):
+        text = (
+            "Tip of the day: how to write better prompts.\n"
+            "A step-by-step guide to RAG.\n"
+            "Bonus: our prompt cheat sheet."
+        )
+
+        assert NewsletterParser._looks_newsless(text)
+
+    @pytest.mark.parametrize("news", [
+        "OpenAI announced GPT-5.",
+        "Mistral raised $600M at a new valuation.",
+        "Google unveils Gemini 2.",
+        "Apple is acquiring an AI startup.",
+    ])
+    def test_news_signal_keeps_tutorial_edition(self, news):
+        text = f"How to prompt. A tutorial. A walkthrough.\n{news}"
+
+        assert not NewsletterParser._looks_newsless(text)
+
+    def test_too_few_tutorial_markers(self):
+        assert not NewsletterParser._looks_newsless("How to prompt, and a tutorial. Opinion: AI is fun.")
+
+    def test_news_words_need_word_boundaries(self):
+        text = "How to prompt. A tutorial. A walkthrough. Praised by readers, refunded never."
+
+        assert NewsletterParser._looks_newsless(text)
@@ -0,0 +1,59 @@
+"""Tests for splitting podcast scripts into TTS chunks."""
+
+import pytest
+
+from src.audio.tts_client import TTSClient
+
+
+@pytest.fixture
+def tts():
+    """TTSClient without an API key (script splitting only)."""
+    return TTSClient.__new__(TTSClient)
+
+
+class TestSplitScript:
+    def test_short_script_is_one_chunk(self, tts):
+        assert tts.split_script("Hello.\n\nWelcome to the briefing.") == [
+            "Hello.\n\nWelcome to the briefing."
+        ]
+
+    def test_drops_blank_paragraphs(self, tts):
+        assert tts.split_script("  \n\nOne.\n\n\n\n  Two.  \n\n") == ["One.\n\nTwo."]
+
+    def test_empty_script(self, tts):
+        assert tts.split_script("") == []
+        assert tts.split_script([]) == []
+
+    def test_splits_on_paragraph_boundaries(self, tts):
+        paragraphs = [c * 1000 for c in "abcde"]
+
+        chunks = tts.split_script("\n\n".join(paragraphs))
+
+        assert chunks == [
+            "\n\n".join(paragraphs[0:2]),
+            "\n\n".join(paragraphs[2:4]),
+            paragraphs[4],
+        ]
+        assert all(len(chunk) <= TTSClient.MAX_CHUNK_CHARS for chunk in chunks)
+
+    def test_chunk_exactly_at_limit(self, tts):
+        first = "a" * (TTSClient.MAX_CHUNK_CHARS - 3)
+
+        assert tts.split_script(f"{first}\n\nb") == [f"{first}\n\nb"]
+        assert tts.split_script(f"{first}\n\nbc") == [first, "bc"]
+
+    def test_oversized_paragraph_stays_whole(self, tts):
+        long_paragraph = "x" * (TTSClient.MAX_CHUNK_CHARS + 1)
+
+        assert tts.split_script(f"intro\n\n{long_paragraph}\n\noutro") == [
+            "intro",
+            long_paragraph,
+            "outro",
+        ]
+
+    def test_sections_are_split_like_one_script(self, tts):
+        sections = ["Intro.\n\nStory one.", "Story two.", "Outro."]
+
+        assert tts.split_script(sections) == [
+            "Intro.\n\nStory one.\n\nStory two.\n\nOutro."
+        ]